@@ -1,5 +1,6 @@
 import os
-from flask import Flask, request, send_from_directory
+import time
+from flask import Flask, g, request, send_from_directory
 from dotenv import load_dotenv
 from backend.app.core import (
     ENUM_DB_ENV,
@@ -8,12 +9,21 @@ from backend.app.core import (
     ENUM_CORS,
     ENUM_URL_PREFIX,
     ENUM_CONFIG_DB_KEY,
+    ENUM_MODELS_ENV,
+    ENUM_MODEL_SERVER_ENV,
+    ENUM_IMAGE_ENV,
+    ENUM_WEBCAM_ENV,
+    ENUM_ENDPOINT_APP,
 )
 from flask_cors import CORS
 from backend.app.extension import ext
 from mongoengine import connect
-from backend.app.controllers import bp_user, bp_auth, bp_model
-from backend.app.log import logger
+from backend.app.controllers import bp_user, bp_auth, bp_model, ns_webcam
+from backend.app.services.registry_service import service_registry
+from backend.app.services.metrics_service import service_metrics
+from backend.app.services.model_server_service import service_model_server
+from backend.app.services.timing_service import service_timing
+from backend.app.log import logger, log_access
 from werkzeug.exceptions import (
     HTTPException,
     NotFound,
@@ -23,7 +33,6 @@ from werkzeug.exceptions import (
     Unauthorized,
     MethodNotAllowed,
 )
-from flask_socketio import SocketIO
 from backend.app.core import create_json_response, get_client_info
 
 load_dotenv()
@@ -35,6 +44,8 @@ class Config:
     FLASK_DEBUG: str = os.environ.get(ENUM_FLASK_ENV.DEBUG.value)
     FLASK_ENV: str = os.environ.get(ENUM_FLASK_ENV.ENV.value)
     FLASK_PORT: str = os.environ.get(ENUM_FLASK_ENV.PORT.value)
+    # /auth et /user seulement : ni route /model ni chargement des modèles.
+    API_ONLY: bool = os.environ.get(ENUM_FLASK_ENV.API_ONLY.value, "0") == "1"
 
     # DB #
     MONGODB_CONFIG: dict[str, str] = {
@@ -48,6 +59,37 @@ class Config:
     JWT_IDENTITY_CLAIM: str = os.environ.get(ENUM_JWT_ENV.IDENTITY_CLAIM.value)
     JWT_TOKEN_LOCATION: list[str] = [os.environ.get(ENUM_JWT_ENV.TOKEN_LOCATION.value)]
 
+    # Uploads (multipart overhead included) #
+    MAX_CONTENT_LENGTH: int = int(
+        os.environ.get(ENUM_IMAGE_ENV.MAX_BYTES.value, 20 * 1024 * 1024)
+    ) + 64 * 1024
+
+    # Socket.IO ("threading" : l'inférence est liée au CPU) #
+    SOCKETIO_ASYNC_MODE: str = os.environ.get(
+        ENUM_WEBCAM_ENV.ASYNC_MODE.value, "threading"
+    )
+    # Plusieurs workers gunicorn : file Redis partagée (redis://host:6379/0)
+    # et sessions collantes côté proxy ; sans elle, un seul worker.
+    SOCKETIO_MESSAGE_QUEUE: str | None = os.environ.get(
+        ENUM_WEBCAM_ENV.MESSAGE_QUEUE.value
+    )
+    # Origines autorisées, séparées par des virgules ; vide : même origine.
+    SOCKETIO_CORS_ORIGINS: list[str] = [
+        origin.strip()
+        for origin in os.environ.get(ENUM_WEBCAM_ENV.CORS_ORIGINS.value, "").split(",")
+        if origin.strip()
+    ]
+
+    # Models #
+    MODELS_PRELOAD: str = os.environ.get(ENUM_MODELS_ENV.MODELS_PRELOAD.value, "")
+    MODELS_WARMUP: str = os.environ.get(ENUM_MODELS_ENV.MODELS_WARMUP.value, "0")
+    MODELS_WARMUP_BATCH_SIZES: list[int] = [
+        int(size)
+        for size in os.environ.get(
+            ENUM_MODELS_ENV.MODELS_WARMUP_BATCH_SIZES.value, "1,4,16"
+        ).split(",")
+    ]
+
 
 class App:
     @staticmethod
@@ -70,25 +112,83 @@ class App:
         # Extensions #
         ext.ma_ext.init_app(app)
         ext.jwt_ext.init_app(app)
+        ext.socketio_ext.init_app(
+            app,
+            cors_allowed_origins=app.config["SOCKETIO_CORS_ORIGINS"] or None,
+            async_mode=app.config["SOCKETIO_ASYNC_MODE"],
+            message_queue=app.config["SOCKETIO_MESSAGE_QUEUE"],
+        )
 
         # Routes with blueprint #
         app.register_blueprint(bp_auth, url_prefix=ENUM_URL_PREFIX.AUTH.value)
         app.register_blueprint(bp_user, url_prefix=ENUM_URL_PREFIX.USER.value)
-        app.register_blueprint(bp_model, url_prefix=ENUM_URL_PREFIX.MODEL.value)
+        if not app.config["API_ONLY"]:
+            app.register_blueprint(bp_model, url_prefix=ENUM_URL_PREFIX.MODEL.value)
+            ext.socketio_ext.on_namespace(ns_webcam)
+
+        # Models registry (lazy by default, "all" or "gs,eagt" to preload) #
+        # Not in web workers when a local model server owns the models.
+        if not app.config["API_ONLY"] and not service_model_server.enabled:
+            service_registry.initialise(
+                app.config["MODELS_PRELOAD"],
+                app.config["MODELS_WARMUP"],
+                app.config["MODELS_WARMUP_BATCH_SIZES"],
+            )
+
+        # Prometheus metrics #
+        if service_metrics.enabled:
+
+            @app.route(ENUM_ENDPOINT_APP.METRICS.value)
+            def metrics():
+                body, content_type = service_metrics.render()
+                return body, 200, {"Content-Type": content_type}
 
         # Middleware Request Handler #
         @app.before_request
-        def log_request_info():
-            client_ip, region, device = get_client_info()
-            logger.info(
-                f"Request: {request.method} {request.url}  - IP: {client_ip} - Region: {region} - Device: {device}"
-            )
+        def start_request_timer():
+            g.request_start = time.perf_counter()
+            g.timing_token = service_timing.start()
+
+        @app.teardown_request
+        def stop_request_timer(exception=None):
+            service_timing.stop(g.pop("timing_token", None))
 
         @app.after_request
         def log_response_info(response):
             client_ip, region, device = get_client_info()
-            logger.info(
-                f"Response: {response.status}  - IP: {client_ip} - Region: {region} - Device: {device}"
+            start = g.get("request_start")
+            duration = time.perf_counter() - start if start else 0.0
+            # Routes inconnues regroupées pour borner la cardinalité.
+            service_metrics.observe_request(
+                request.blueprint or "app",
+                request.endpoint or "unmatched",
+                request.method,
+                response.status_code,
+                duration,
+            )
+            timer = service_timing.current()
+            if timer is not None:
+                response.headers["Server-Timing"] = timer.header()
+                if (
+                    service_timing.debug
+                    and response.is_json
+                    and request.headers.get(service_timing.DEBUG_HEADER) == "1"
+                ):
+                    body = response.get_json(silent=True)
+                    if isinstance(body, dict):
+                        body["timings"] = timer.as_dict()
+                        response.set_data(app.json.dumps(body))
+            log_access(
+                response.status_code,
+                method=request.method,
+                path=request.path,
+                endpoint=request.endpoint,
+                duration_ms=round(duration * 1000, 2),
+                stages=timer.as_dict() if timer is not None else None,
+                bytes=response.calculate_content_length(),
+                ip=client_ip,
+                region=region,
+                device=device,
             )
             return response
 
@@ -193,4 +293,10 @@ class App:
         return app
 
 
-app = App.create_app()
+# Les processus d'inférence du serveur de modèles n'ont besoin ni de Flask
+# ni de MongoDB.
+app = (
+    None
+    if os.environ.get(ENUM_MODEL_SERVER_ENV.INFERENCE_PROCESS.value) == "1"
+    else App.create_app()
+)
@@ -1,3 +1,4 @@
 from .controller_auth import bp_auth
 from .controller_models import bp_model
 from .controller_user import bp_user
+from .controller_webcam import ns_webcam
@@ -1,13 +1,24 @@
 from flask import Blueprint, request
 from backend.app.core.utility import create_json_response
-from backend.app.exeptions import ModelTypeNotFoundError
+from backend.app.exeptions import (
+    ModelTypeNotFoundError,
+    ImageTooLargeError,
+    InvalidImageError,
+    JobNotFoundError,
+    ModelServerError,
+)
 from backend.app.core.const.enum import (
     ENUM_ENDPOINT_MODEL,
     ENUM_METHODS,
     ENUM_BLUEPRINT_ID,
 )
-from backend.app.services.models_service import Service_MODEL
+from backend.app.services.image_service import service_image
+from backend.app.services.job_service import service_job
+from backend.app.services.model_server_service import service_model_server
+from backend.app.services.registry_service import service_registry
+from backend.app.services.webcam_service import service_webcam
 from marshmallow import ValidationError
+from werkzeug.exceptions import RequestEntityTooLarge
 
 
 bp_model = Blueprint(ENUM_BLUEPRINT_ID.MODEL.value, __name__)
@@ -23,35 +34,206 @@ def predict(typeModel: str):
                 message="Aucun fichier image ou base64 n'a été fourni.",
             )
 
-        image_file = request.files["image"]
-        model = Service_MODEL(typeModel)
-        message = model.handle_prediction(image_file)
+        data = service_image.read_upload(request.files["image"])
+        message = service_registry.handle_prediction(typeModel, data)
         return create_json_response(status="success", message=message)
     except ValidationError as e:
-        create_json_response(
+        return create_json_response(
             status_code=400,
             status="fail",
             message="Erreur dans la validation des données fournis",
             details=f"{str(e)}",
         )
     except TypeError as e:
-        create_json_response(
+        return create_json_response(
             status_code=404,
             status="fail",
             message="Erreur de type de donnée",
             details=f"{str(e)}",
         )
     except ModelTypeNotFoundError as e:
-        create_json_response(
+        return create_json_response(
+            status_code=404,
+            status="fail",
+            message="Aucun model trouvée",
+            details=f"{str(e)}",
+        )
+    except (ImageTooLargeError, RequestEntityTooLarge) as e:
+        return create_json_response(
+            status_code=413,
+            status="fail",
+            message="L'image envoyée est trop volumineuse",
+            details=f"{str(e)}",
+        )
+    except InvalidImageError as e:
+        return create_json_response(
+            status_code=400,
+            status="fail",
+            message="Le fichier envoyé n'est pas une image lisible",
+            details=f"{str(e)}",
+        )
+    except ModelServerError as e:
+        return create_json_response(
+            status_code=503,
+            status="fail",
+            message="Le serveur de modèles est indisponible",
+            details=f"{str(e)}",
+        )
+    except Exception as e:
+        return create_json_response(
+            status_code=404,
+            status="fail",
+            message="Une erreur est survenue",
+            details=f"{str(e)}",
+        )
+
+
+@bp_model.route(
+    ENUM_ENDPOINT_MODEL.PREDICT_MULTI.value, methods=[ENUM_METHODS.POST.value]
+)
+def predict_multi():
+    try:
+        if "image" not in request.files:
+            return create_json_response(
+                status_code=400,
+                status="fail",
+                message="Aucun fichier image ou base64 n'a été fourni.",
+            )
+
+        typeModels = list(
+            dict.fromkeys(
+                typeModel.strip()
+                for value in request.form.getlist("models")
+                + request.args.getlist("models")
+                for typeModel in value.split(",")
+                if typeModel.strip()
+            )
+        )
+        if not typeModels:
+            return create_json_response(
+                status_code=400,
+                status="fail",
+                message="Aucun type de model n'a été fourni (champ 'models').",
+            )
+
+        data = service_image.read_upload(request.files["image"])
+        results = service_registry.handle_multi_prediction(data, typeModels)
+        return create_json_response(status="success", data=results)
+    except ModelTypeNotFoundError as e:
+        return create_json_response(
+            status_code=404,
+            status="fail",
+            message="Aucun model trouvée",
+            details=f"{str(e)}",
+        )
+    except (ImageTooLargeError, RequestEntityTooLarge) as e:
+        return create_json_response(
+            status_code=413,
+            status="fail",
+            message="L'image envoyée est trop volumineuse",
+            details=f"{str(e)}",
+        )
+    except InvalidImageError as e:
+        return create_json_response(
+            status_code=400,
+            status="fail",
+            message="Le fichier envoyé n'est pas une image lisible",
+            details=f"{str(e)}",
+        )
+    except ModelServerError as e:
+        return create_json_response(
+            status_code=503,
+            status="fail",
+            message="Le serveur de modèles est indisponible",
+            details=f"{str(e)}",
+        )
+    except Exception as e:
+        return create_json_response(
+            status_code=404,
+            status="fail",
+            message="Une erreur est survenue",
+            details=f"{str(e)}",
+        )
+
+
+@bp_model.route(ENUM_ENDPOINT_MODEL.JOB_SUBMIT.value, methods=[ENUM_METHODS.POST.value])
+def submit_job(typeModel: str):
+    try:
+        if "image" not in request.files:
+            return create_json_response(
+                status_code=400,
+                status="fail",
+                message="Aucun fichier image ou base64 n'a été fourni.",
+            )
+
+        data = service_image.read_upload(request.files["image"])
+        job_id = service_job.submit(typeModel, data)
+        return create_json_response(
+            status_code=202,
+            status="success",
+            message="La prédiction a été mise en file d'attente",
+            job_id=job_id,
+        )
+    except ModelTypeNotFoundError as e:
+        return create_json_response(
             status_code=404,
             status="fail",
             message="Aucun model trouvée",
             details=f"{str(e)}",
         )
+    except (ImageTooLargeError, RequestEntityTooLarge) as e:
+        return create_json_response(
+            status_code=413,
+            status="fail",
+            message="L'image envoyée est trop volumineuse",
+            details=f"{str(e)}",
+        )
     except Exception as e:
-        create_json_response(
+        return create_json_response(
+            status_code=503,
+            status="fail",
+            message="Impossible de mettre la prédiction en file d'attente",
+            details=f"{str(e)}",
+        )
+
+
+@bp_model.route(ENUM_ENDPOINT_MODEL.JOB_STATUS.value, methods=[ENUM_METHODS.GET.value])
+def job_status(job_id: str):
+    try:
+        return create_json_response(status="success", data=service_job.get(job_id))
+    except JobNotFoundError as e:
+        return create_json_response(
             status_code=404,
             status="fail",
+            message="Job introuvable",
+            details=f"{str(e)}",
+        )
+    except Exception as e:
+        return create_json_response(
+            status_code=503,
+            status="fail",
             message="Une erreur est survenue",
             details=f"{str(e)}",
         )
+
+
+@bp_model.route(ENUM_ENDPOINT_MODEL.REGISTRY.value, methods=[ENUM_METHODS.GET.value])
+def registry():
+    return create_json_response(
+        status="success",
+        data=service_registry.stats() | {"webcam": service_webcam.stats()},
+    )
+
+
+@bp_model.route(ENUM_ENDPOINT_MODEL.READY.value, methods=[ENUM_METHODS.GET.value])
+def ready():
+    if service_model_server.enabled:
+        readiness = service_model_server.readiness()
+    else:
+        readiness = service_registry.readiness()
+
+    return create_json_response(
+        status_code=200 if readiness["ready"] else 503,
+        status="success" if readiness["ready"] else "fail",
+        data=readiness,
+    )
@@ -0,0 +1,29 @@
+from flask import request
+from flask_socketio import ConnectionRefusedError, Namespace
+from backend.app.core.const.enum import ENUM_SOCKET_NAMESPACE
+from backend.app.services.jwt_service import service_jwt
+from backend.app.services.webcam_service import service_webcam
+
+
+class WebcamNamespace(Namespace):
+    """
+    Namespace Socket.IO du modèle wrtv : le client émet "frame" (octets de
+    l'image ou data URL, éventuellement dans {"id": ..., "image": ...}) et
+    reçoit "result" avec les visages et attributs de chaque image traitée.
+    La connexion exige un access token : io("/wrtv", {auth: {token}}).
+    """
+
+    def on_connect(self, auth=None):
+        token = auth.get("token") if isinstance(auth, dict) else None
+        if service_jwt.decode_access_token(token) is None:
+            raise ConnectionRefusedError("Access token manquant ou invalide")
+        service_webcam.open(request.sid)
+
+    def on_disconnect(self, *args):
+        service_webcam.close(request.sid)
+
+    def on_frame(self, data):
+        service_webcam.push(request.sid, data)
+
+
+ns_webcam = WebcamNamespace(ENUM_SOCKET_NAMESPACE.WEBCAM.value)
@@ -12,6 +12,7 @@ class ENUM_FLASK_ENV(e):
     DEBUG: str = "FLASK_DEBUG"
     ENV: str = "FLASK_ENV"
     PORT: str = "FLASK_PORT"
+    API_ONLY: str = "API_ONLY"
 
 
 class ENUM_DB_ENV(e):
@@ -33,6 +34,8 @@ class ENUM_LOGGER_ENV(e):
     LOG_FILE_PATH: str = "LOG_FILE_PATH"
     LOG_FILE_MAX_BYTES: str = "LOG_FILE_MAX_BYTES"
     LOG_FILE_BACKUP_COUNT: str = "LOG_FILE_BACKUP_COUNT"
+    ACCESS_LOG_FILE_PATH: str = "ACCESS_LOG_FILE_PATH"
+    ACCESS_LOG_SAMPLE_RATE: str = "ACCESS_LOG_SAMPLE_RATE"
 
 
 class ENUM_REDIS_ENV(e):
@@ -41,6 +44,46 @@ class ENUM_REDIS_ENV(e):
     REDIS_DB: str = "REDIS_DB"
 
 
+class ENUM_GEOIP_ENV(e):
+    DB_PATH: str = "GEOIP_DB_PATH"
+    CACHE_SIZE: str = "GEOIP_CACHE_SIZE"
+
+
+class ENUM_CACHE_ENV(e):
+    ENABLED: str = "CACHE_ENABLED"
+    TTL_SECONDS: str = "CACHE_TTL_SECONDS"
+    MAX_ENTRIES: str = "CACHE_MAX_ENTRIES"
+    REDIS_ENABLED: str = "CACHE_REDIS_ENABLED"
+
+
+class ENUM_REVOCATION_ENV(e):
+    CACHE_ENABLED: str = "REVOCATION_CACHE_ENABLED"
+    TTL_SECONDS: str = "REVOCATION_CACHE_TTL_SECONDS"
+    MAX_ENTRIES: str = "REVOCATION_CACHE_MAX_ENTRIES"
+    CHANNEL: str = "REVOCATION_CHANNEL"
+    BLOOM_ENABLED: str = "REVOCATION_BLOOM_ENABLED"
+    BLOOM_CAPACITY: str = "REVOCATION_BLOOM_CAPACITY"
+    REDIS_TIMEOUT: str = "REVOCATION_REDIS_TIMEOUT"
+    BREAKER_SECONDS: str = "REVOCATION_BREAKER_SECONDS"
+    MAX_STALENESS: str = "REVOCATION_MAX_STALENESS_SECONDS"
+
+
+class ENUM_JOB_ENV(e):
+    QUEUE_NAME: str = "JOB_QUEUE_NAME"
+    TTL_SECONDS: str = "JOB_TTL_SECONDS"
+    HEARTBEAT_SECONDS: str = "JOB_HEARTBEAT_SECONDS"
+    MAX_ATTEMPTS: str = "JOB_MAX_ATTEMPTS"
+
+
+class ENUM_MODEL_SERVER_ENV(e):
+    ENABLED: str = "MODEL_SERVER_ENABLED"
+    ADDRESS: str = "MODEL_SERVER_ADDRESS"
+    AUTHKEY: str = "MODEL_SERVER_AUTHKEY"
+    PROCESSES: str = "MODEL_SERVER_PROCESSES"
+    START_TIMEOUT: str = "MODEL_SERVER_START_TIMEOUT"
+    INFERENCE_PROCESS: str = "MODEL_SERVER_INFERENCE_PROCESS"
+
+
 class ENUM_MODELS_ENV(e):
     PATH_AGE_MODEL: str = "PATH_AGE_MODEL"
     PATH_GENDER_AGE_MODEL: str = "PATH_GENDER_AGE_MODEL"
@@ -50,6 +93,72 @@ class ENUM_MODELS_ENV(e):
     PATH_GENDER_ETHNIE_MODEL: str = "PATH_GENDER_ETHNIE_MODEL"
     PATH_ETHNIE_MODEL: str = "PATH_ETHNIE_MODEL"
     PATH_YOLO: str = "PATH_YOLO"
+    MODELS_PRELOAD: str = "MODELS_PRELOAD"
+    MODELS_VERSION: str = "MODELS_VERSION"
+    MODELS_WARMUP: str = "MODELS_WARMUP"
+    MODELS_WARMUP_BATCH_SIZES: str = "MODELS_WARMUP_BATCH_SIZES"
+    KERAS_COMPILED: str = "KERAS_COMPILED"
+    KERAS_JIT_COMPILE: str = "KERAS_JIT_COMPILE"
+
+
+class ENUM_IMAGE_ENV(e):
+    MAX_BYTES: str = "IMAGE_MAX_BYTES"
+    MAX_PIXELS: str = "IMAGE_MAX_PIXELS"
+    DECODE_MAX_SIDE: str = "IMAGE_DECODE_MAX_SIDE"
+
+
+class ENUM_DETECTOR_ENV(e):
+    BACKEND: str = "FACE_DETECTOR"
+    DNN_PROTOTXT: str = "PATH_FACE_DNN_PROTOTXT"
+    DNN_MODEL: str = "PATH_FACE_DNN_MODEL"
+    DNN_CONFIDENCE: str = "FACE_DNN_CONFIDENCE"
+    MAX_SIDE: str = "FACE_DETECT_MAX_SIDE"
+    REFINE: str = "FACE_DETECT_REFINE"
+    REFINE_FACTOR: str = "FACE_DETECT_REFINE_FACTOR"
+
+
+class ENUM_METRICS_ENV(e):
+    ENABLED: str = "METRICS_ENABLED"
+    MULTIPROC_DIR: str = "PROMETHEUS_MULTIPROC_DIR"
+
+
+class ENUM_TIMING_ENV(e):
+    ENABLED: str = "SERVER_TIMING_ENABLED"
+    DEBUG: str = "SERVER_TIMING_DEBUG"
+
+
+class ENUM_ONNX_ENV(e):
+    BACKEND: str = "MODELS_BACKEND"
+    MODELS_DIR: str = "ONNX_MODELS_DIR"
+    INTRA_OP_THREADS: str = "ONNX_INTRA_OP_THREADS"
+    INTER_OP_THREADS: str = "ONNX_INTER_OP_THREADS"
+    INT8_ENABLED: str = "ONNX_INT8_ENABLED"
+
+
+class ENUM_SCHEDULER_ENV(e):
+    ENABLED: str = "SCHEDULER_ENABLED"
+    WINDOW_MS: str = "SCHEDULER_WINDOW_MS"
+    MAX_BATCH: str = "SCHEDULER_MAX_BATCH"
+
+
+class ENUM_WEBCAM_ENV(e):
+    MODEL_TYPE: str = "WEBCAM_MODEL_TYPE"
+    MAX_FPS: str = "WEBCAM_MAX_FPS"
+    ASYNC_MODE: str = "SOCKETIO_ASYNC_MODE"
+    MESSAGE_QUEUE: str = "SOCKETIO_MESSAGE_QUEUE"
+    CORS_ORIGINS: str = "SOCKETIO_CORS_ORIGINS"
+
+
+class ENUM_TRACKER_ENV(e):
+    ENABLED: str = "TRACKER_ENABLED"
+    DETECT_EVERY: str = "TRACKER_DETECT_EVERY"
+    MIN_CONFIDENCE: str = "TRACKER_MIN_CONFIDENCE"
+    IOU_THRESHOLD: str = "TRACKER_IOU_THRESHOLD"
+    MAX_MISSES: str = "TRACKER_MAX_MISSES"
+    CROP_CHANGE: str = "TRACKER_CROP_CHANGE"
+    RECLASSIFY_EVERY: str = "TRACKER_RECLASSIFY_EVERY"
+    SMOOTHING: str = "TRACKER_SMOOTHING"
+    VOTES: str = "TRACKER_VOTES"
 
 
 ############################################################
@@ -89,6 +198,20 @@ class ENUM_URL_PREFIX(e):
     USER: str = "/user"
 
 
+class ENUM_ENDPOINT_APP(e):
+    METRICS: str = "/metrics"
+
+
+class ENUM_SOCKET_NAMESPACE(e):
+    WEBCAM: str = "/wrtv"
+
+
+class ENUM_SOCKET_EVENT(e):
+    FRAME: str = "frame"
+    RESULT: str = "result"
+    ERROR: str = "error"
+
+
 class ENUM_ENDPOINT_AUTH(e):
     LOGIN: str = "/login"
     REGISTRY: str = "/registry"
@@ -103,6 +226,11 @@ class ENUM_ENDPOINT_AUTH(e):
 
 class ENUM_ENDPOINT_MODEL(e):
     PREDICT: str = "/predict/<string:typeModel>"
+    PREDICT_MULTI: str = "/predict-multi"
+    JOB_SUBMIT: str = "/jobs/submit/<string:typeModel>"
+    JOB_STATUS: str = "/jobs/<string:job_id>"
+    REGISTRY: str = "/registry"
+    READY: str = "/ready"
 
 
 class ENUM_ENDPOINT_USER(e):
@@ -238,3 +366,32 @@ class ENUM_MODELS_TYPE(e):
     GENDER_AND_AGE_TRANSFER: str = "gat"
     WEBCAM_REAL_TIME_VISION: str = "wrtv"
     ETHNIE_AGE_GENDER_TRANSFER: str = "eagt"
+
+
+class ENUM_MODELS_SERVED(e):
+    TYPES: list[str] = [
+        ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value,
+        ENUM_MODELS_TYPE.GENDER_SCRATCH.value,
+        ENUM_MODELS_TYPE.AGE_SCRATCH.value,
+        ENUM_MODELS_TYPE.GENDER_AND_AGE_TRANSFER.value,
+        ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value,
+    ]
+
+
+class ENUM_DETECTOR_TYPE(e):
+    HOG: str = "hog"
+    MTCNN: str = "mtcnn"
+    HAAR: str = "haar"
+    DNN: str = "dnn"
+
+
+class ENUM_JOB_STATUS(e):
+    QUEUED: str = "queued"
+    RUNNING: str = "running"
+    DONE: str = "done"
+    FAILED: str = "failed"
+
+
+class ENUM_MODELS_BACKEND(e):
+    NATIVE: str = "native"
+    ONNX: str = "onnx"
@@ -1,14 +1,15 @@
+import os
 import pytz
 from datetime import datetime, timedelta
-from backend.app.core import ENUM_TIMEZONE
-from flask import jsonify, request
-import base64
-import cv2
-import numpy as np
-import requests
+from functools import lru_cache
+from backend.app.core import ENUM_TIMEZONE, ENUM_GEOIP_ENV
+from flask import g, jsonify, request
 from user_agents import parse
+from dotenv import load_dotenv
 from backend.app.log import logger
 
+load_dotenv()
+
 
 def get_paris_time():
     """
@@ -37,27 +38,113 @@ def create_json_response(status_code=200, **kwargs):
     return response
 
 
+@lru_cache(maxsize=1)
+def get_geoip_reader():
+    """
+    Ouvre une seule fois la base GeoIP locale (fichier .mmdb MaxMind).
+
+    Returns:
+        geoip2.database.Reader | None: Le lecteur de la base, ou None si
+        GEOIP_DB_PATH n'est pas défini ou si le fichier est introuvable.
+    """
+    path = os.environ.get(ENUM_GEOIP_ENV.DB_PATH.value)
+    if not path or not os.path.exists(path):
+        logger.warning("GeoIP database not configured, regions will be 'Unknown'")
+        return None
+
+    import geoip2.database
+
+    return geoip2.database.Reader(path)
+
+
+@lru_cache(maxsize=int(os.environ.get(ENUM_GEOIP_ENV.CACHE_SIZE.value, 4096)))
+def resolve_region(client_ip: str | None) -> str:
+    """
+    Résout la région d'une adresse IP depuis la base GeoIP locale.
+
+    Le résultat est mis en cache (LRU borné par GEOIP_CACHE_SIZE) : aucune
+    requête réseau n'est faite.
+
+    Args:
+        client_ip (str | None): L'adresse IP du client.
+
+    Returns:
+        str: La région (ou à défaut le pays) du client, "Unknown" sinon.
+    """
+    reader = get_geoip_reader()
+    if reader is None or not client_ip:
+        return "Unknown"
+
+    from geoip2.errors import AddressNotFoundError
+
+    try:
+        if "City" in reader.metadata().database_type:
+            city = reader.city(client_ip)
+            return (
+                city.subdivisions.most_specific.name or city.country.name or "Unknown"
+            )
+        return reader.country(client_ip).country.name or "Unknown"
+    except (AddressNotFoundError, ValueError):
+        return "Unknown"
+
+
+@lru_cache(maxsize=1024)
+def parse_device(user_agent: str) -> str:
+    """
+    Analyse un en-tête User-Agent (mémoïsé par chaîne).
+
+    Args:
+        user_agent (str): La valeur de l'en-tête User-Agent.
+
+    Returns:
+        str: La famille, la marque et le modèle de l'appareil.
+    """
+    device = parse(user_agent).device
+    return f"{device.family} {device.brand} {device.model}"
+
+
 def get_client_info():
     """
     Récupère les informations du client à partir de la requête en cours.
 
-    Cette fonction extrait l'adresse IP du client, analyse l'en-tête User-Agent pour obtenir des informations sur l'appareil,
-    et utilise un service de géolocalisation pour déterminer la région du client.
+    L'adresse IP, la région (base GeoIP locale) et l'appareil (User-Agent)
+    sont calculés une seule fois par requête puis conservés dans flask.g
+    pour les hooks et gestionnaires d'erreurs suivants.
 
     Returns:
         tuple: Un tuple contenant l'adresse IP du client (str), la région (str) et les informations sur l'appareil (str).
     """
-    client_ip = request.remote_addr
-    user_agent = parse(request.headers.get("User-Agent"))
-    try:
-        response = requests.get(f"http://ipinfo.io/{client_ip}/json")
-        region = response.json().get("region", "Unknown")
-    except Exception as e:
-        logger.error(f"Error fetching region info: {str(e)}")
-        region = "Unknown"
+    client_info = g.get("client_info")
+    if client_info is None:
+        client_ip = request.remote_addr
+        client_info = (
+            client_ip,
+            resolve_region(client_ip),
+            parse_device(request.headers.get("User-Agent", "")),
+        )
+        g.client_info = client_info
+    return client_info
+
+
+def get_process_rss() -> int:
+    """
+    Retourne la mémoire résidente (RSS) actuelle du processus en octets.
 
-    device = f"{user_agent.device.family} {user_agent.device.brand} {user_agent.device.model}"
-    return client_ip, region, device
+    Lit /proc/self/statm sous Linux et se rabat sur le pic RSS fourni par
+    resource.getrusage sur les autres systèmes.
+
+    Returns:
+        int: La mémoire résidente du processus en octets.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
 
 
 def send_reset_password_email(to: str, html_content: str) -> None:
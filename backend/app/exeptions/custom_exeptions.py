@@ -79,6 +79,46 @@ class ModelTypeNotFoundError(Exception):
         )
 
 
+class ImageTooLargeError(Exception):
+    def __init__(self, limit: str) -> None:
+        super().__init__(f"L'image dépasse la taille maximale autorisée ({limit})")
+
+
+class InvalidImageError(Exception):
+    def __init__(self, details: str) -> None:
+        super().__init__(f"Le fichier fourni n'est pas une image valide - {details}")
+
+
+class ModelServerError(Exception):
+    def __init__(self, details: str) -> None:
+        super().__init__(
+            f"Le serveur de modèles n'a pas pu traiter l'image - {details}"
+        )
+
+
+class ModelServerConfigError(Exception):
+    def __init__(self, details: str) -> None:
+        super().__init__(f"Configuration du serveur de modèles invalide - {details}")
+
+
+class ModelServerStartError(Exception):
+    def __init__(self, details: str) -> None:
+        super().__init__(f"Le serveur de modèles n'a pas pu démarrer - {details}")
+
+
+class RevocationPropagationError(Exception):
+    def __init__(self, details: str) -> None:
+        super().__init__(
+            "La révocation est enregistrée mais n'a pas pu être propagée "
+            f"aux autres workers - {details}"
+        )
+
+
+class JobNotFoundError(Exception):
+    def __init__(self, jobId: str) -> None:
+        super().__init__(f"Aucun job trouvé avec l'id {jobId} (inconnu ou expiré)")
+
+
 class ConversationNotFoundError(Exception):
     def __init__(self, conversationId: int) -> None:
         super().__init__(
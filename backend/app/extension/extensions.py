@@ -1,7 +1,11 @@
+import os
 from flask_jwt_extended import JWTManager
 from flask_marshmallow import Marshmallow
+from flask_socketio import SocketIO
 from passlib.context import CryptContext
+from redis import Redis
 from typing import Self
+from backend.app.core.const.enum import ENUM_REDIS_ENV
 
 
 class Extensions:
@@ -11,6 +15,8 @@ class Extensions:
         self._pwd_context_ext: CryptContext = CryptContext(
             schemes=["pbkdf2_sha256"], deprecated="auto"
         )
+        self._redis_ext: Redis | None = None
+        self._socketio_ext: SocketIO = SocketIO()
 
     @property
     def ma_ext(self: Self) -> Marshmallow:
@@ -24,5 +30,20 @@ class Extensions:
     def pwd_context_ext(self: Self) -> CryptContext:
         return self._pwd_context_ext
 
+    @property
+    def socketio_ext(self: Self) -> SocketIO:
+        return self._socketio_ext
+
+    @property
+    def redis_ext(self: Self) -> Redis:
+        # Le client ne se connecte qu'au premier appel.
+        if self._redis_ext is None:
+            self._redis_ext = Redis(
+                host=os.environ.get(ENUM_REDIS_ENV.REDIS_HOST.value, "localhost"),
+                port=int(os.environ.get(ENUM_REDIS_ENV.REDIS_PORT.value, 6379)),
+                db=int(os.environ.get(ENUM_REDIS_ENV.REDIS_DB.value, 0)),
+            )
+        return self._redis_ext
+
 
 ext = Extensions()
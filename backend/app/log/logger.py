@@ -1,22 +1,54 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from backend.app.core.const import ENUM_LOGGER_ENV
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+ACCESS_LOGGER_NAME = "app_access"
 
-def setup_logger():
-    logger = logging.getLogger("app_logger")
-    logger.setLevel(logging.DEBUG)
 
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_formatter = logging.Formatter(
+class JsonLinesFormatter(logging.Formatter):
+    # Un enregistrement d'accès par ligne JSON.
+
+    def format(self, record):
+        fields = getattr(record, "access", None) or {"message": record.getMessage()}
+        return json.dumps(
+            {
+                "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                **fields,
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+
+
+class NameFilter(logging.Filter):
+    # Aiguille les enregistrements du listener vers le bon handler.
+
+    def __init__(self, name, accept=True):
+        super().__init__()
+        self._name = name
+        self._accept = accept
+
+    def filter(self, record):
+        return (record.name == self._name) == self._accept
+
+
+def setup_handlers():
+    log_format = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
-    console_handler.setFormatter(console_formatter)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(log_format)
 
     log_file_path = os.environ.get(ENUM_LOGGER_ENV.LOG_FILE_PATH.value)
     log_file_max_bytes = int(os.environ.get(ENUM_LOGGER_ENV.LOG_FILE_MAX_BYTES.value))
@@ -28,15 +60,85 @@ def setup_logger():
         log_file_path, maxBytes=log_file_max_bytes, backupCount=log_file_backup_count
     )
     file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    file_handler.setFormatter(log_format)
+
+    for handler in (console_handler, file_handler):
+        handler.addFilter(NameFilter(ACCESS_LOGGER_NAME, accept=False))
+
+    # Journal d'accès JSON-lines : fichier dédié, ou console à défaut.
+    access_file_path = os.environ.get(ENUM_LOGGER_ENV.ACCESS_LOG_FILE_PATH.value)
+    access_handler = (
+        RotatingFileHandler(
+            access_file_path,
+            maxBytes=log_file_max_bytes,
+            backupCount=log_file_backup_count,
+        )
+        if access_file_path
+        else logging.StreamHandler()
     )
-    file_handler.setFormatter(file_formatter)
+    access_handler.setFormatter(JsonLinesFormatter())
+    access_handler.addFilter(NameFilter(ACCESS_LOGGER_NAME))
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    return console_handler, file_handler, access_handler
+
+
+def start_listener():
+    # Le thread de la requête ne fait que déposer l'enregistrement dans la
+    # file ; le formatage, l'écriture et la rotation se font dans le thread
+    # du QueueListener.
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *HANDLERS, respect_handler_level=True)
+    listener.start()
+    return log_queue, listener
+
+
+def restart_listener_after_fork():
+    # Le thread du listener ne survit pas au fork (workers gunicorn).
+    global listener
+    log_queue, listener = start_listener()
+    for queue_handler in QUEUE_HANDLERS:
+        queue_handler.queue = log_queue
+
+
+def setup_logger(name, level):
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    queue_handler = QueueHandler(LOG_QUEUE)
+    logger.addHandler(queue_handler)
+    QUEUE_HANDLERS.append(queue_handler)
 
     return logger
 
 
-logger = setup_logger()
+HANDLERS = setup_handlers()
+QUEUE_HANDLERS = []
+LOG_QUEUE, listener = start_listener()
+atexit.register(lambda: listener.stop())
+os.register_at_fork(after_in_child=restart_listener_after_fork)
+
+logger = setup_logger("app_logger", logging.DEBUG)
+access_logger = setup_logger(ACCESS_LOGGER_NAME, logging.INFO)
+
+ACCESS_LOG_SAMPLE_RATE = float(
+    os.environ.get(ENUM_LOGGER_ENV.ACCESS_LOG_SAMPLE_RATE.value, 1.0)
+)
+
+
+def log_access(status_code, **fields):
+    """
+    Enregistre une ligne d'accès structurée (JSON-lines).
+
+    Les réponses en erreur (>= 400) sont toujours journalisées ; les autres
+    le sont avec la probabilité ACCESS_LOG_SAMPLE_RATE.
+
+    Args:
+        status_code (int): Le code de statut HTTP de la réponse.
+        **fields: Les champs de l'enregistrement (méthode, route, durée, ...).
+    """
+    if status_code < 400 and random.random() >= ACCESS_LOG_SAMPLE_RATE:
+        return
+    access_logger.info(
+        "access", extra={"access": {"status": status_code, **fields}}
+    )
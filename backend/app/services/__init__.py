@@ -1,5 +1,15 @@
 from .auth_service import service_auth
 from .jwt_service import service_jwt
 from .db_service import service_db
+from .cache_service import service_cache
+from .detector_service import service_detector
+from .image_service import service_image
+from .job_service import service_job
+from .metrics_service import service_metrics
 from .models_service import Service_MODEL
+from .model_server_service import service_model_server
+from .registry_service import service_registry
+from .revocation_service import service_revocation
+from .timing_service import service_timing
 from .user_service import Service_USER
+from .webcam_service import service_webcam
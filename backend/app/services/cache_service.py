@@ -0,0 +1,148 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Self
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_CACHE_ENV, ENUM_MODELS_ENV
+from backend.app.extension.extensions import ext
+from backend.app.log import logger
+from backend.app.services.metrics_service import service_metrics
+
+load_dotenv()
+
+
+class Service_CACHE:
+    """
+    Cache des prédictions adressé par le contenu de l'image.
+
+    La clé combine le SHA-256 des octets de l'image, le type de modèle et la
+    version des modèles. Un premier niveau LRU en mémoire (TTL + nombre
+    d'entrées maximal) est complété par un niveau Redis optionnel partagé
+    entre les workers, dont l'éviction par taille relève de maxmemory.
+    """
+
+    KEY_PREFIX: str = "predict"
+
+    def __init__(self: Self) -> None:
+        self.enabled = os.environ.get(ENUM_CACHE_ENV.ENABLED.value, "1") == "1"
+        self.ttl = int(os.environ.get(ENUM_CACHE_ENV.TTL_SECONDS.value, 3600))
+        self.max_entries = int(os.environ.get(ENUM_CACHE_ENV.MAX_ENTRIES.value, 1024))
+        self.redis_enabled = (
+            os.environ.get(ENUM_CACHE_ENV.REDIS_ENABLED.value, "0") == "1"
+        )
+        self.version = os.environ.get(ENUM_MODELS_ENV.MODELS_VERSION.value, "1")
+
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "redis_errors": 0,
+        }
+
+    def key(self: Self, data: bytes, typeModel: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{self.KEY_PREFIX}:{self.version}:{typeModel}:{digest}"
+
+    def get_or_compute(
+        self: Self, data: bytes, typeModel: str, compute: Callable[[], str]
+    ) -> str:
+        if not self.enabled:
+            return compute()
+
+        key = self.key(data, typeModel)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def get(self: Self, key: str) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    service_metrics.count_cache("memory_hit")
+                    return value
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+        value = self._redis_get(key)
+        if value is not None:
+            self._memory_set(key, value)
+            self._count("redis_hits")
+            service_metrics.count_cache("redis_hit")
+            return value
+
+        self._count("misses")
+        service_metrics.count_cache("miss")
+        return None
+
+    def set(self: Self, key: str, value: str) -> None:
+        self._memory_set(key, value)
+        self._redis_set(key, value)
+
+    def _memory_set(self: Self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def _redis_get(self: Self, key: str) -> str | None:
+        if not self.redis_enabled:
+            return None
+        try:
+            value = ext.redis_ext.get(key)
+            return value.decode("utf-8") if value is not None else None
+        except Exception as e:
+            self._count("redis_errors")
+            logger.warning(f"Prediction cache: Redis read failed: {str(e)}")
+            return None
+
+    def _redis_set(self: Self, key: str, value: str) -> None:
+        if not self.redis_enabled:
+            return
+        try:
+            ext.redis_ext.set(key, value.encode("utf-8"), ex=self.ttl)
+        except Exception as e:
+            self._count("redis_errors")
+            logger.warning(f"Prediction cache: Redis write failed: {str(e)}")
+
+    def _count(self: Self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self: Self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+
+        hits = counters["memory_hits"] + counters["redis_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "redis_enabled": self.redis_enabled,
+            "version": self.version,
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": entries,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        } | counters
+
+
+service_cache: Service_CACHE = Service_CACHE()
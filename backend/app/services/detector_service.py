@@ -0,0 +1,283 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Self
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_DETECTOR_ENV, ENUM_DETECTOR_TYPE
+from backend.app.log import logger
+
+load_dotenv()
+
+# Les boîtes suivent la convention de face_recognition : (top, right, bottom, left).
+Box = tuple[int, int, int, int]
+
+
+def box_iou(box_a: Box, box_b: Box) -> float:
+    top_a, right_a, bottom_a, left_a = box_a
+    top_b, right_b, bottom_b, left_b = box_b
+
+    inter_w = min(right_a, right_b) - max(left_a, left_b)
+    inter_h = min(bottom_a, bottom_b) - max(top_a, top_b)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+
+    inter = inter_w * inter_h
+    area_a = (right_a - left_a) * (bottom_a - top_a)
+    area_b = (right_b - left_b) * (bottom_b - top_b)
+    return inter / float(area_a + area_b - inter)
+
+
+def scale_box(box: Box, scale: float, offset: tuple[int, int] = (0, 0)) -> Box:
+    top, right, bottom, left = box
+    offset_y, offset_x = offset
+    return (
+        (top + offset_y) / scale,
+        (right + offset_x) / scale,
+        (bottom + offset_y) / scale,
+        (left + offset_x) / scale,
+    )
+
+
+def resize_image(image: np.ndarray, scale: float) -> np.ndarray:
+    height, width = image.shape[:2]
+    return cv2.resize(
+        image,
+        (max(1, round(width * scale)), max(1, round(height * scale))),
+        interpolation=cv2.INTER_AREA,
+    )
+
+
+def tile_starts(length: int, tile: int, step: int) -> list[int]:
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile + 1, step))
+    if starts[-1] + tile < length:
+        starts.append(length - tile)
+    return starts
+
+
+def clip_box(box: Box, width: int, height: int) -> Box:
+    top, right, bottom, left = box
+    return (
+        max(0, int(top)),
+        min(width, int(right)),
+        min(height, int(bottom)),
+        max(0, int(left)),
+    )
+
+
+class FaceDetector(ABC):
+    name: str = ""
+
+    @abstractmethod
+    def detect(self: Self, image: np.ndarray) -> list[Box]:
+        pass
+
+
+class HogFaceDetector(FaceDetector):
+    name = ENUM_DETECTOR_TYPE.HOG.value
+
+    def __init__(self: Self) -> None:
+        import face_recognition
+
+        self._face_locations = face_recognition.face_locations
+
+    def detect(self: Self, image: np.ndarray) -> list[Box]:
+        return [tuple(box) for box in self._face_locations(image, model="hog")]
+
+
+class MtcnnFaceDetector(FaceDetector):
+    name = ENUM_DETECTOR_TYPE.MTCNN.value
+
+    def __init__(self: Self) -> None:
+        import torch
+        from facenet_pytorch import MTCNN
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._mtcnn = MTCNN(keep_all=True, device=device)
+
+    def detect(self: Self, image: np.ndarray) -> list[Box]:
+        boxes, _ = self._mtcnn.detect(image)
+        if boxes is None:
+            return []
+
+        height, width = image.shape[:2]
+        return [
+            clip_box((y1, x2, y2, x1), width, height) for x1, y1, x2, y2 in boxes
+        ]
+
+
+class HaarFaceDetector(FaceDetector):
+    name = ENUM_DETECTOR_TYPE.HAAR.value
+
+    def __init__(self: Self) -> None:
+        self._cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+
+    def detect(self: Self, image: np.ndarray) -> list[Box]:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        faces = self._cascade.detectMultiScale(
+            gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
+        )
+        return [(int(y), int(x + w), int(y + h), int(x)) for x, y, w, h in faces]
+
+
+class DnnFaceDetector(FaceDetector):
+    """
+    Détecteur SSD ResNet-10 (res10_300x300) via le module DNN d'OpenCV.
+    """
+
+    name = ENUM_DETECTOR_TYPE.DNN.value
+
+    INPUT_SIZE: tuple[int, int] = (300, 300)
+    MEAN: tuple[float, float, float] = (104.0, 177.0, 123.0)
+
+    def __init__(self: Self, prototxt: str, model: str, confidence: float) -> None:
+        self._net = cv2.dnn.readNetFromCaffe(prototxt, model)
+        self._confidence = confidence
+        self._lock = threading.Lock()
+
+    def detect(self: Self, image: np.ndarray) -> list[Box]:
+        height, width = image.shape[:2]
+        bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        blob = cv2.dnn.blobFromImage(
+            cv2.resize(bgr, self.INPUT_SIZE), 1.0, self.INPUT_SIZE, self.MEAN
+        )
+
+        # Un cv2.dnn.Net n'est pas réentrant.
+        with self._lock:
+            self._net.setInput(blob)
+            detections = self._net.forward()
+
+        boxes = []
+        for detection in detections[0, 0]:
+            if detection[2] < self._confidence:
+                continue
+            x1, y1, x2, y2 = detection[3:7] * np.array([width, height, width, height])
+            box = clip_box((y1, x2, y2, x1), width, height)
+            if box[1] > box[3] and box[2] > box[0]:
+                boxes.append(box)
+        return boxes
+
+
+class Service_DETECTOR:
+    # Recouvrement entre tuiles et seuil IoU de dédoublonnage de la passe
+    # d'affinage.
+    TILE_OVERLAP: float = 0.25
+    REFINE_IOU: float = 0.3
+
+    def __init__(self: Self) -> None:
+        self._detectors: dict[str, FaceDetector] = {}
+        self._lock = threading.Lock()
+
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self: Self) -> None:
+        self._detectors = {}
+        self._lock = threading.Lock()
+
+    def default_backend(self: Self) -> str:
+        backend = os.environ.get(ENUM_DETECTOR_ENV.BACKEND.value)
+        if backend:
+            return backend.lower()
+        if self._dnn_paths():
+            return ENUM_DETECTOR_TYPE.DNN.value
+        return ENUM_DETECTOR_TYPE.HAAR.value
+
+    def _dnn_paths(self: Self) -> tuple[str, str] | None:
+        prototxt = os.environ.get(ENUM_DETECTOR_ENV.DNN_PROTOTXT.value)
+        model = os.environ.get(ENUM_DETECTOR_ENV.DNN_MODEL.value)
+        return (prototxt, model) if prototxt and model else None
+
+    def get(self: Self, backend: str | None = None) -> FaceDetector:
+        backend = backend or self.default_backend()
+        detector = self._detectors.get(backend)
+        if detector is not None:
+            return detector
+
+        with self._lock:
+            detector = self._detectors.get(backend)
+            if detector is None:
+                detector = self._create(backend)
+                self._detectors[backend] = detector
+                logger.info(f"Face detector '{backend}' initialised")
+        return detector
+
+    def _create(self: Self, backend: str) -> FaceDetector:
+        match backend:
+            case ENUM_DETECTOR_TYPE.HOG.value:
+                return HogFaceDetector()
+            case ENUM_DETECTOR_TYPE.MTCNN.value:
+                return MtcnnFaceDetector()
+            case ENUM_DETECTOR_TYPE.HAAR.value:
+                return HaarFaceDetector()
+            case ENUM_DETECTOR_TYPE.DNN.value:
+                paths = self._dnn_paths()
+                if paths is None:
+                    logger.warning(
+                        "Face detector 'dnn' requested without model files, falling back to 'haar'"
+                    )
+                    return HaarFaceDetector()
+                return DnnFaceDetector(
+                    *paths,
+                    confidence=float(
+                        os.environ.get(ENUM_DETECTOR_ENV.DNN_CONFIDENCE.value, 0.5)
+                    ),
+                )
+            case _:
+                raise ValueError(f"Détecteur de visages inconnu : '{backend}'")
+
+    def detect(self: Self, image: np.ndarray, backend: str | None = None) -> list[Box]:
+        if image.ndim == 2:
+            image = np.stack([image] * 3, axis=-1)
+        image = np.ascontiguousarray(image)
+        detector = self.get(backend)
+
+        # La détection tourne sur une miniature bornée ; les boîtes sont
+        # ensuite ramenées aux coordonnées de l'image pleine résolution.
+        height, width = image.shape[:2]
+        max_side = int(os.environ.get(ENUM_DETECTOR_ENV.MAX_SIDE.value, 1024))
+        scale = min(1.0, max_side / max(height, width))
+        if scale == 1.0:
+            return detector.detect(image)
+
+        boxes = [
+            clip_box(scale_box(box, scale), width, height)
+            for box in detector.detect(resize_image(image, scale))
+        ]
+
+        if os.environ.get(ENUM_DETECTOR_ENV.REFINE.value, "0") == "1":
+            boxes = self._refine(detector, image, boxes, max_side)
+        return boxes
+
+    def _refine(
+        self: Self,
+        detector: FaceDetector,
+        image: np.ndarray,
+        boxes: list[Box],
+        max_side: int,
+    ) -> list[Box]:
+        # Passe d'affinage pour les petits visages manqués par la miniature :
+        # l'image est découpée en tuiles de max_side pixels à une résolution
+        # plus élevée (REFINE_FACTOR fois la miniature).
+        height, width = image.shape[:2]
+        factor = float(os.environ.get(ENUM_DETECTOR_ENV.REFINE_FACTOR.value, 2))
+        scale = min(1.0, max_side * factor / max(height, width))
+        level = resize_image(image, scale) if scale < 1.0 else image
+        level_height, level_width = level.shape[:2]
+        step = max(1, int(max_side * (1 - self.TILE_OVERLAP)))
+
+        for y in tile_starts(level_height, max_side, step):
+            for x in tile_starts(level_width, max_side, step):
+                tile = np.ascontiguousarray(level[y : y + max_side, x : x + max_side])
+                for box in detector.detect(tile):
+                    box = clip_box(scale_box(box, scale, (y, x)), width, height)
+                    if all(box_iou(box, known) < self.REFINE_IOU for known in boxes):
+                        boxes.append(box)
+        return boxes
+
+
+service_detector: Service_DETECTOR = Service_DETECTOR()
@@ -0,0 +1,78 @@
+import io
+import math
+import os
+from typing import Self
+import numpy as np
+from dotenv import load_dotenv
+from PIL import Image, ImageOps, UnidentifiedImageError
+from backend.app.core.const.enum import ENUM_IMAGE_ENV
+from backend.app.exeptions import ImageTooLargeError, InvalidImageError
+
+load_dotenv()
+
+
+class Service_IMAGE:
+    def __init__(self: Self) -> None:
+        self.max_bytes = int(
+            os.environ.get(ENUM_IMAGE_ENV.MAX_BYTES.value, 20 * 1024 * 1024)
+        )
+        self.max_pixels = int(os.environ.get(ENUM_IMAGE_ENV.MAX_PIXELS.value, 50_000_000))
+        self.decode_max_side = int(
+            os.environ.get(ENUM_IMAGE_ENV.DECODE_MAX_SIDE.value, 2048)
+        )
+
+    def load(self: Self, imageFile) -> np.ndarray:
+        return self.decode(self.read_upload(imageFile))
+
+    def read_upload(self: Self, imageFile) -> bytes:
+        stream = getattr(imageFile, "stream", imageFile)
+        data = stream.read(self.max_bytes + 1)
+        if len(data) > self.max_bytes:
+            raise ImageTooLargeError(f"{self.max_bytes} octets")
+        return data
+
+    def decode(self: Self, data: bytes) -> np.ndarray:
+        """
+        Décode une image en un unique tableau RGB uint8 contigu.
+
+        Seul l'en-tête est lu avant la vérification du nombre de pixels. Les
+        JPEG sont décodés à échelle réduite via draft() tant que le plus grand
+        côté reste au moins égal à decode_max_side, puis l'orientation EXIF est
+        appliquée.
+        """
+        try:
+            image = Image.open(io.BytesIO(data))
+        except Image.DecompressionBombError:
+            # Levée par Pillow dès l'en-tête, avant notre propre contrôle.
+            raise ImageTooLargeError(f"{self.max_pixels} pixels")
+        except (UnidentifiedImageError, OSError) as e:
+            raise InvalidImageError(str(e))
+
+        width, height = image.size
+        if width * height > self.max_pixels:
+            raise ImageTooLargeError(f"{self.max_pixels} pixels")
+
+        if image.format == "JPEG" and max(width, height) > self.decode_max_side:
+            ratio = self.decode_max_side / max(width, height)
+            image.draft("RGB", (math.ceil(width * ratio), math.ceil(height * ratio)))
+
+        try:
+            image = ImageOps.exif_transpose(image)
+            return self.to_rgb_array(image)
+        except (OSError, ValueError) as e:
+            raise InvalidImageError(str(e))
+
+    def to_rgb_array(self: Self, image: Image.Image) -> np.ndarray:
+        if image.mode in ("I;16", "I;16B", "I;16L", "I", "F"):
+            # Images 16 bits / flottantes : remise à l'échelle sur 8 bits.
+            array = np.asarray(image, dtype=np.float32)
+            peak = array.max()
+            array = (array * (255.0 / peak) if peak > 0 else array).astype(np.uint8)
+            return np.ascontiguousarray(np.stack([array] * 3, axis=-1))
+
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return np.ascontiguousarray(np.asarray(image))
+
+
+service_image: Service_IMAGE = Service_IMAGE()
@@ -0,0 +1,232 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Self
+from dotenv import load_dotenv
+from backend.app.core.const.enum import (
+    ENUM_JOB_ENV,
+    ENUM_JOB_STATUS,
+    ENUM_MODELS_SERVED,
+)
+from backend.app.exeptions import JobNotFoundError, ModelTypeNotFoundError
+from backend.app.extension.extensions import ext
+from backend.app.log import logger
+
+load_dotenv()
+
+# Retire un job de la liste de traitement d'un worker perdu et, s'il lui
+# reste des tentatives, le remet en tête de file (côté BLMOVE) en une seule
+# opération : le job n'est jamais à la fois dans les deux listes, ni perdu.
+# Renvoie {job_id, tentatives, remis en file (1) ou non (0)}.
+_REQUEUE_SCRIPT = """
+local job_id = redis.call("RPOP", KEYS[1])
+if not job_id then
+    return nil
+end
+local job_key = ARGV[1] .. ":" .. job_id
+local attempts = tonumber(redis.call("HGET", job_key, "attempts") or "0")
+if attempts >= tonumber(ARGV[2]) then
+    return {job_id, attempts, 0}
+end
+redis.call("RPUSH", KEYS[2], job_id)
+redis.call("HSET", job_key, "status", ARGV[3])
+return {job_id, attempts, 1}
+"""
+
+
+class Service_JOB:
+    """
+    File de prédictions asynchrones dans Redis.
+
+    Le web se contente de déposer l'image et l'identifiant du job ; les
+    workers d'inférence (worker.py) consomment la file avec leurs propres
+    instances de Service_MODEL et écrivent le résultat sous l'identifiant
+    du job, avec un TTL.
+
+    Un worker déplace le job (BLMOVE) dans sa propre liste de traitement et
+    ne l'en retire qu'une fois le résultat écrit. Tant qu'il tourne, il
+    entretient une clé de vie (JOB_HEARTBEAT_SECONDS) ; les jobs d'un worker
+    dont la clé a expiré sont remis en file par les autres, au plus
+    JOB_MAX_ATTEMPTS fois avant d'être marqués en échec.
+    """
+
+    def __init__(self: Self) -> None:
+        self.prefix = os.environ.get(ENUM_JOB_ENV.QUEUE_NAME.value, "predict:jobs")
+        self.ttl = int(os.environ.get(ENUM_JOB_ENV.TTL_SECONDS.value, 3600))
+        self.heartbeat = int(
+            os.environ.get(ENUM_JOB_ENV.HEARTBEAT_SECONDS.value, 30)
+        )
+        self.max_attempts = int(os.environ.get(ENUM_JOB_ENV.MAX_ATTEMPTS.value, 3))
+
+    @property
+    def queue_key(self: Self) -> str:
+        return f"{self.prefix}:queue"
+
+    @property
+    def channel(self: Self) -> str:
+        return f"{self.prefix}:done"
+
+    @property
+    def workers_key(self: Self) -> str:
+        return f"{self.prefix}:workers"
+
+    def processing_key(self: Self, worker_id: str) -> str:
+        return f"{self.prefix}:processing:{worker_id}"
+
+    def heartbeat_key(self: Self, worker_id: str) -> str:
+        return f"{self.prefix}:heartbeat:{worker_id}"
+
+    def job_key(self: Self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def image_key(self: Self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}:image"
+
+    def submit(self: Self, typeModel: str, data: bytes) -> str:
+        if typeModel not in ENUM_MODELS_SERVED.TYPES.value:
+            raise ModelTypeNotFoundError(typeModel)
+
+        job_id = uuid.uuid4().hex
+        pipeline = ext.redis_ext.pipeline()
+        pipeline.set(self.image_key(job_id), data, ex=self.ttl)
+        pipeline.hset(
+            self.job_key(job_id),
+            mapping={
+                "status": ENUM_JOB_STATUS.QUEUED.value,
+                "typeModel": typeModel,
+                "created_at": time.time(),
+            },
+        )
+        pipeline.expire(self.job_key(job_id), self.ttl)
+        pipeline.lpush(self.queue_key, job_id)
+        pipeline.execute()
+        return job_id
+
+    def get(self: Self, job_id: str) -> dict:
+        job = ext.redis_ext.hgetall(self.job_key(job_id))
+        if not job:
+            raise JobNotFoundError(job_id)
+
+        job = {
+            key.decode("utf-8"): value.decode("utf-8") for key, value in job.items()
+        }
+        job["job_id"] = job_id
+        return job
+
+    def _finish(self: Self, job_id: str, **fields) -> None:
+        pipeline = ext.redis_ext.pipeline()
+        pipeline.hset(
+            self.job_key(job_id), mapping=fields | {"finished_at": time.time()}
+        )
+        pipeline.expire(self.job_key(job_id), self.ttl)
+        pipeline.delete(self.image_key(job_id))
+        pipeline.publish(
+            self.channel, json.dumps({"job_id": job_id, "status": fields["status"]})
+        )
+        pipeline.execute()
+
+    def process(self: Self, job_id: str) -> None:
+        from backend.app.services.registry_service import service_registry
+
+        typeModel = ext.redis_ext.hget(self.job_key(job_id), "typeModel")
+        data = ext.redis_ext.get(self.image_key(job_id))
+        if typeModel is None or data is None:
+            logger.warning(f"Job {job_id} expired before being processed")
+            return
+
+        pipeline = ext.redis_ext.pipeline()
+        pipeline.hset(
+            self.job_key(job_id),
+            mapping={
+                "status": ENUM_JOB_STATUS.RUNNING.value,
+                "started_at": time.time(),
+            },
+        )
+        pipeline.hincrby(self.job_key(job_id), "attempts", 1)
+        pipeline.execute()
+        try:
+            result = service_registry.handle_prediction(
+                typeModel.decode("utf-8"), data
+            )
+            self._finish(job_id, status=ENUM_JOB_STATUS.DONE.value, result=result)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            self._finish(job_id, status=ENUM_JOB_STATUS.FAILED.value, error=str(e))
+
+    def requeue_stale(self: Self) -> int:
+        # Remet en file les jobs des workers dont la clé de vie a expiré.
+        requeued = 0
+        for worker_id in ext.redis_ext.smembers(self.workers_key):
+            worker_id = worker_id.decode("utf-8")
+            if ext.redis_ext.exists(self.heartbeat_key(worker_id)):
+                continue
+
+            requeue = ext.redis_ext.register_script(_REQUEUE_SCRIPT)
+            processing = self.processing_key(worker_id)
+            while (
+                moved := requeue(
+                    keys=[processing, self.queue_key],
+                    args=[
+                        self.prefix,
+                        self.max_attempts,
+                        ENUM_JOB_STATUS.QUEUED.value,
+                    ],
+                )
+            ) is not None:
+                job_id, attempts, requeued_job = moved
+                job_id = job_id.decode("utf-8")
+                if not requeued_job:
+                    self._finish(
+                        job_id,
+                        status=ENUM_JOB_STATUS.FAILED.value,
+                        error=f"Worker lost {attempts} times while processing the job",
+                    )
+                    continue
+                requeued += 1
+                logger.warning(f"Job {job_id} requeued from lost worker {worker_id}")
+
+            ext.redis_ext.srem(self.workers_key, worker_id)
+        return requeued
+
+    def _keep_alive(self: Self, worker_id: str, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                ext.redis_ext.set(
+                    self.heartbeat_key(worker_id), 1, ex=self.heartbeat
+                )
+            except Exception as e:
+                logger.warning(f"Inference worker heartbeat failed: {str(e)}")
+            stop.wait(self.heartbeat / 3)
+
+    def run_worker(self: Self, block_timeout: int = 5) -> None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        processing = self.processing_key(worker_id)
+
+        stop = threading.Event()
+        ext.redis_ext.set(self.heartbeat_key(worker_id), 1, ex=self.heartbeat)
+        ext.redis_ext.sadd(self.workers_key, worker_id)
+        threading.Thread(
+            target=self._keep_alive, args=(worker_id, stop), daemon=True
+        ).start()
+
+        logger.info(f"Inference worker {worker_id} listening on '{self.queue_key}'")
+        try:
+            while True:
+                self.requeue_stale()
+                job_id = ext.redis_ext.blmove(
+                    self.queue_key, processing, block_timeout, "RIGHT", "LEFT"
+                )
+                if job_id is None:
+                    continue
+                self.process(job_id.decode("utf-8"))
+                # Acquittement : le job ne quitte la liste qu'une fois terminé.
+                ext.redis_ext.lrem(processing, 1, job_id)
+        finally:
+            stop.set()
+            ext.redis_ext.delete(self.heartbeat_key(worker_id))
+
+
+service_job: Service_JOB = Service_JOB()
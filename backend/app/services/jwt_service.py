@@ -8,6 +8,7 @@ from backend.app.core.const.enum import (
     ENUM_TIMEZONE,
 )
 from backend.app.services.db_service import service_db
+from backend.app.services.revocation_service import service_revocation
 from backend.app.core.utility.utils import get_paris_time
 from mongoengine.errors import DoesNotExist
 from backend.app.extension.extensions import ext
@@ -30,12 +31,18 @@ class Service_JWT:
         )
 
         service_db.add_to_db(db_token)
+        service_revocation.remember_valid(db_token.jti, decoded_token["exp"])
 
     def revoke_token(self, token_jti, user_id) -> None:
+        # MongoDB d'abord : les caches des workers ne sont invalidés qu'une
+        # fois la révocation enregistrée.
         try:
             token = service_db.find_token_by_filters(jti=token_jti, user_id=user_id)
+            if token is None:
+                raise DoesNotExist()
             token.is_revoked = True
             service_db.add_to_db(token)
+            service_revocation.publish({token.jti: token.expires.timestamp()})
 
         except DoesNotExist as e:
             raise DoesNotExist(
@@ -46,26 +53,44 @@ class Service_JWT:
             raise Exception(f"Une erreur est survenu - \n {e}")
 
     def revoke_all_tokens(self, user_id: int) -> None:
-        tokens = service_db.find_token_by_filters(multiple=True, user_id=user_id)
-        for token in tokens:
-            token.is_revoked = True
-            service_db.add_to_db(token)
+        tokens = service_db.find_token_by_filters(
+            multiple=True, user_id=user_id, is_revoked=False
+        )
+        revoked = {token.jti: token.expires.timestamp() for token in tokens}
+        if not revoked:
+            return
+
+        # Une seule mise à jour MongoDB, limitée aux jti lus (un token émis
+        # entre-temps ne serait pas publié), puis invalidation des caches.
+        tokens.filter(jti__in=list(revoked)).update(set__is_revoked=True)
+        service_revocation.publish(revoked)
 
     def is_token_revoked(self, jwt_payload) -> bool:
         jti = jwt_payload[ENUM_DECODED_TOKEN_KEY.JTI.value]
         user_id = jwt_payload[app.config.get(ENUM_JWT_ENV.IDENTITY_CLAIM.value)]
 
-        try:
+        def lookup() -> tuple[bool, float | None]:
             token = service_db.find_token_by_filters(jti=jti, user_id=user_id)
-            return token.is_revoked
+            if token is None:
+                return False, None
+            return token.is_revoked, token.expires.timestamp()
 
-        except DoesNotExist as e:
-            DoesNotExist(
-                f"Aucun token trouver avec jti = {jti}, _id = {user_id} - \n {e}"
-            )
+        return service_revocation.is_revoked(jti, lookup)
 
-        except Exception as e:
-            Exception(f"Une erreur est survenu - \n {e}")
+    def decode_access_token(self, encoded_token: str | None) -> dict | None:
+        # Hors des routes @jwt_required (Socket.IO) : signature, expiration,
+        # type "access" et révocation, None si l'un d'eux échoue.
+        if not encoded_token:
+            return None
+        try:
+            decoded_token = decode_token(encoded_token)
+            if decoded_token.get(ENUM_DECODED_TOKEN_KEY.TYPE.value) != "access":
+                return None
+            if self.is_token_revoked(decoded_token):
+                return None
+            return decoded_token
+        except Exception:
+            return None
 
     def is_token_expired(self, expiration_timestamp) -> bool:
         if expiration_timestamp is None:
@@ -90,7 +115,7 @@ def check_if_token_revoked(jwt_headers, jwt_payload):
 
         if service_jwt.is_token_expired(jwt_payload[ENUM_DECODED_TOKEN_KEY.EXP.value]):
             service_jwt.revoke_token(
-                jti=jwt_payload[ENUM_DECODED_TOKEN_KEY.JTI.value],
+                token_jti=jwt_payload[ENUM_DECODED_TOKEN_KEY.JTI.value],
                 user_id=jwt_payload[app.config.get(ENUM_JWT_ENV.IDENTITY_CLAIM.value)],
             )
             return True
@@ -0,0 +1,138 @@
+import os
+from typing import Self
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_METRICS_ENV
+
+load_dotenv()
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+STAGE_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+FACES_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 4, 5, 8, 12, 20, 50)
+
+
+class Service_METRICS:
+    """
+    Métriques Prometheus de l'API et de l'inférence, exposées sur /metrics.
+
+    Avec gunicorn, PROMETHEUS_MULTIPROC_DIR doit pointer vers un dossier
+    vide au démarrage : chaque worker (et chaque processus du serveur de
+    modèles) y écrit ses valeurs, agrégées à la lecture par
+    MultiProcessCollector ; gunicorn.conf.py nettoie les workers arrêtés.
+    Le taux de succès du cache se calcule à partir de
+    prediction_cache_lookups_total{result=~".*_hit"} / sum(...), celui du
+    repli de genre à partir de model_gender_fallbacks_total /
+    model_gender_faces_total.
+    """
+
+    def __init__(self: Self) -> None:
+        self.enabled = os.environ.get(ENUM_METRICS_ENV.ENABLED.value, "1") == "1"
+        self.multiprocess_dir = os.environ.get(ENUM_METRICS_ENV.MULTIPROC_DIR.value)
+        if not self.enabled:
+            return
+
+        from prometheus_client import Counter, Gauge, Histogram
+
+        self._requests = Counter(
+            "http_requests_total",
+            "Requêtes HTTP traitées",
+            ["blueprint", "endpoint", "method", "status"],
+        )
+        self._request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Durée des requêtes HTTP",
+            ["blueprint", "endpoint", "method"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self._stage_duration = Histogram(
+            "model_stage_duration_seconds",
+            "Durée de chaque étape d'inférence",
+            ["type_model", "stage"],
+            buckets=STAGE_BUCKETS,
+        )
+        self._faces = Histogram(
+            "model_faces_per_image",
+            "Nombre de visages détectés par image",
+            ["type_model"],
+            buckets=FACES_BUCKETS,
+        )
+        self._load_time = Gauge(
+            "model_load_seconds",
+            "Temps de chargement du modèle",
+            ["type_model"],
+            multiprocess_mode="max",
+        )
+        self._cache_lookups = Counter(
+            "prediction_cache_lookups_total",
+            "Consultations du cache de prédictions",
+            ["result"],
+        )
+        self._gender_faces = Counter(
+            "model_gender_faces_total",
+            "Visages dont le genre a été prédit par YOLO",
+            ["type_model"],
+        )
+        self._gender_fallbacks = Counter(
+            "model_gender_fallbacks_total",
+            "Visages non classés par YOLO, repris par le modèle de genre Keras",
+            ["type_model"],
+        )
+
+    def observe_request(
+        self: Self,
+        blueprint: str,
+        endpoint: str,
+        method: str,
+        status: int,
+        seconds: float,
+    ) -> None:
+        if not self.enabled:
+            return
+        self._requests.labels(blueprint, endpoint, method, str(status)).inc()
+        self._request_duration.labels(blueprint, endpoint, method).observe(seconds)
+
+    def observe_stage(self: Self, typeModel: str, stage: str, seconds: float) -> None:
+        if self.enabled:
+            self._stage_duration.labels(typeModel, stage).observe(seconds)
+
+    def observe_faces(self: Self, typeModel: str, count: int) -> None:
+        if self.enabled:
+            self._faces.labels(typeModel).observe(count)
+
+    def set_load_time(self: Self, typeModel: str, seconds: float) -> None:
+        if self.enabled:
+            self._load_time.labels(typeModel).set(seconds)
+
+    def count_cache(self: Self, result: str) -> None:
+        if self.enabled:
+            self._cache_lookups.labels(result).inc()
+
+    def count_gender_fallback(
+        self: Self, typeModel: str, faces: int, fallbacks: int
+    ) -> None:
+        if self.enabled:
+            self._gender_faces.labels(typeModel).inc(faces)
+            self._gender_fallbacks.labels(typeModel).inc(fallbacks)
+
+    def render(self: Self) -> tuple[bytes, str]:
+        from prometheus_client import (
+            CONTENT_TYPE_LATEST,
+            REGISTRY,
+            CollectorRegistry,
+            generate_latest,
+        )
+
+        if not self.multiprocess_dir:
+            return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+service_metrics: Service_METRICS = Service_METRICS()
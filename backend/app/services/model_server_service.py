@@ -0,0 +1,356 @@
+import multiprocessing
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+from typing import Self
+import numpy as np
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_MODEL_SERVER_ENV, ENUM_MODELS_ENV
+from backend.app.exeptions import (
+    ModelServerConfigError,
+    ModelServerError,
+    ModelServerStartError,
+    ModelTypeNotFoundError,
+)
+from backend.app.log import logger
+from backend.app.services.timing_service import service_timing
+
+load_dotenv()
+
+
+_startup_barrier = None
+
+
+def _init_inference_process(barrier) -> None:
+    # Préchargement et préchauffage bloquants : le processus ne prend aucune
+    # requête avant d'être prêt.
+    global _startup_barrier
+    _startup_barrier = barrier
+
+    from backend.app.services.registry_service import service_registry
+
+    warmup = os.environ.get(ENUM_MODELS_ENV.MODELS_WARMUP.value, "0")
+    batch_sizes = os.environ.get(
+        ENUM_MODELS_ENV.MODELS_WARMUP_BATCH_SIZES.value, "1,4,16"
+    )
+    service_registry.initialise(
+        os.environ.get(ENUM_MODELS_ENV.MODELS_PRELOAD.value, ""),
+        "0" if warmup == "0" else "1",
+        [int(size) for size in batch_sizes.split(",")],
+    )
+
+
+def _report_readiness(timeout: float) -> dict:
+    # La barrière retient chaque tâche jusqu'à ce que toutes tournent : une
+    # tâche par processus, chacun démarré et initialisé.
+    from backend.app.services.registry_service import service_registry
+
+    _startup_barrier.wait(timeout)
+    return {"pid": os.getpid()} | service_registry.readiness()
+
+
+def _run_inference(request: dict) -> dict:
+    # Exécuté dans un processus d'inférence : l'image est lue directement
+    # dans le segment de mémoire partagée créé par le worker web.
+    token = service_timing.start(force=True) if request.get("timing") else None
+    try:
+        response = _infer(request)
+        if token is not None:
+            response["stages"] = service_timing.current().stages
+        return response
+    finally:
+        service_timing.stop(token)
+
+
+def _infer(request: dict) -> dict:
+    from backend.app.services.registry_service import service_registry
+
+    shm = SharedMemory(name=request["shm"])
+    # Le segment appartient au worker web : on évite que le resource_tracker
+    # de ce processus ne le supprime à sa sortie.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    image = None
+    try:
+        image = np.ndarray(request["shape"], dtype=np.uint8, buffer=shm.buf)
+        match request.get("op", "predict"):
+            case "detect":
+                from backend.app.services.detector_service import service_detector
+
+                boxes = service_detector.detect(image)
+                return {"boxes": [tuple(int(v) for v in box) for box in boxes]}
+            case "faces":
+                # Flux webcam : attributs par visage plutôt qu'un message.
+                model = service_registry.get(request["typeModel"])
+                regions = request.get("regions")
+                if regions is None:
+                    regions = model.extract_faces(image)
+                    if isinstance(regions, str):
+                        return {"faces": []}
+                return {"faces": model.predict_faces(image, regions)}
+            case _:
+                results, faces = service_registry.predict_image(
+                    image, request["typeModels"]
+                )
+                return {"results": results, "faces": faces}
+    except ModelTypeNotFoundError as e:
+        return {"error": str(e), "error_type": "ModelTypeNotFoundError"}
+    except Exception as e:
+        return {"error": str(e), "error_type": type(e).__name__}
+    finally:
+        # Plus aucune vue ne doit référencer le segment avant close().
+        image = None
+        shm.close()
+
+
+class Service_MODEL_SERVER:
+    """
+    Pool local de processus d'inférence propriétaires des modèles.
+
+    Le serveur (model_server.py) écoute sur un socket Unix ; les workers web
+    y envoient seulement le nom d'un segment multiprocessing.shared_memory
+    contenant l'image décodée, sa forme et les types de modèles demandés, et
+    récupèrent un résultat structuré. La mémoire par machine dépend ainsi du
+    nombre de processus d'inférence, pas du nombre de workers web.
+
+    Le Listener désérialise tout ce qu'il reçoit : MODEL_SERVER_AUTHKEY est
+    obligatoire (secrets.token_hex(32), par exemple) et le socket est créé
+    dans un dossier privé (0700), lui-même en 0600.
+    """
+
+    def __init__(self: Self) -> None:
+        self.enabled = os.environ.get(ENUM_MODEL_SERVER_ENV.ENABLED.value, "0") == "1"
+        self.address = os.environ.get(
+            ENUM_MODEL_SERVER_ENV.ADDRESS.value,
+            os.path.join(
+                os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+                f"sae_model_server-{os.getuid()}",
+                "model_server.sock",
+            ),
+        )
+        authkey = os.environ.get(ENUM_MODEL_SERVER_ENV.AUTHKEY.value)
+        self.authkey = authkey.encode("utf-8") if authkey else None
+        self.processes = int(os.environ.get(ENUM_MODEL_SERVER_ENV.PROCESSES.value, 2))
+        self.start_timeout = float(
+            os.environ.get(ENUM_MODEL_SERVER_ENV.START_TIMEOUT.value, 600)
+        )
+
+        self._local = threading.local()
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._readiness: dict = {"ready": False, "processes": []}
+
+        # Échec dès le démarrage des workers web plutôt qu'à la première
+        # prédiction.
+        if self.enabled:
+            self.check_authkey()
+
+    def check_authkey(self: Self) -> None:
+        if not self.authkey:
+            raise ModelServerConfigError(
+                f"{ENUM_MODEL_SERVER_ENV.AUTHKEY.value} doit être défini"
+            )
+
+    # Côté worker web #
+
+    def _connection(self: Self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or connection.closed:
+            connection = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.connection = connection
+        return connection
+
+    def readiness(self: Self) -> dict:
+        try:
+            connection = self._connection()
+            connection.send({"readiness": True})
+            return connection.recv() | {"model_server": True}
+        except (OSError, EOFError) as e:
+            self._local.connection = None
+            return {"ready": False, "model_server": True, "error": str(e)}
+
+    def predict(self: Self, image: np.ndarray, typeModels: list[str]) -> dict:
+        return self._request(image, {"typeModels": typeModels}, typeModels)
+
+    def predict_faces(
+        self: Self, image: np.ndarray, typeModel: str, regions: list | None = None
+    ) -> list[dict]:
+        # Sans régions, la détection est faite par le serveur dans le même
+        # aller-retour.
+        request = {"op": "faces", "typeModel": typeModel, "regions": regions}
+        return self._request(image, request, [typeModel])["faces"]
+
+    def detect(self: Self, image: np.ndarray) -> list[tuple[int, int, int, int]]:
+        return self._request(image, {"op": "detect"}, [])["boxes"]
+
+    def _request(
+        self: Self, image: np.ndarray, payload: dict, typeModels: list[str]
+    ) -> dict:
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        shm = SharedMemory(create=True, size=max(1, image.nbytes))
+        try:
+            np.ndarray(image.shape, dtype=np.uint8, buffer=shm.buf)[...] = image
+            request = {
+                "shm": shm.name,
+                "shape": image.shape,
+                "timing": service_timing.current() is not None,
+            } | payload
+            start = time.perf_counter()
+            try:
+                connection = self._connection()
+                connection.send(request)
+                response = connection.recv()
+            except (OSError, EOFError) as e:
+                self._local.connection = None
+                raise ModelServerError(str(e))
+            service_timing.merge(
+                response.pop("stages", {}), time.perf_counter() - start
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if "error" in response:
+            if response["error_type"] == "ModelTypeNotFoundError":
+                raise ModelTypeNotFoundError(", ".join(typeModels))
+            raise ModelServerError(response["error"])
+        return response
+
+    # Côté serveur #
+
+    def _prepare_socket_dir(self: Self) -> None:
+        # Dossier propre au compte du serveur : refusé s'il a été créé par un
+        # autre utilisateur ou s'il est accessible au groupe / aux autres.
+        directory = os.path.dirname(os.path.abspath(self.address))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+        if (
+            not stat.S_ISDIR(info.st_mode)
+            or info.st_uid != os.getuid()
+            or info.st_mode & 0o077
+        ):
+            raise ModelServerConfigError(
+                f"le dossier du socket {directory} doit appartenir à ce compte "
+                "et être en 0700"
+            )
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _start_pool(self: Self) -> ProcessPoolExecutor:
+        # Le pool ne lance ses processus qu'à la demande : une tâche par
+        # processus, soumises d'un coup, les démarre (préchargement et
+        # préchauffage compris) avant la première requête.
+        # Hérité par les processus lancés : backend.app n'y crée pas l'app.
+        os.environ[ENUM_MODEL_SERVER_ENV.INFERENCE_PROCESS.value] = "1"
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=context,
+            initializer=_init_inference_process,
+            initargs=(context.Barrier(self.processes),),
+        )
+        futures = [
+            pool.submit(_report_readiness, self.start_timeout)
+            for _ in range(self.processes)
+        ]
+        try:
+            _, pending = wait(futures, timeout=self.start_timeout)
+            if pending:
+                raise ModelServerStartError(
+                    f"processus non prêts après {self.start_timeout:.0f}s"
+                )
+            processes = [future.result() for future in futures]
+        except Exception:
+            self._terminate(pool)
+            raise
+        self._readiness = {
+            "ready": all(process["ready"] for process in processes),
+            "mode": processes[0]["mode"],
+            "processes": processes,
+        }
+        logger.info(
+            f"Model server: {self.processes} inference processes started "
+            f"(ready: {self._readiness['ready']})"
+        )
+        return pool
+
+    def _terminate(self: Self, pool: ProcessPoolExecutor) -> None:
+        # shutdown() attend la fin des tâches : un processus bloqué dans son
+        # initialisation doit être tué.
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def serve(self: Self) -> None:
+        self.check_authkey()
+        self._prepare_socket_dir()
+
+        self._pool = self._start_pool()
+        umask = os.umask(0o177)
+        try:
+            listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        finally:
+            os.umask(umask)
+        os.chmod(self.address, 0o600)
+        logger.info(
+            f"Model server listening on {self.address} with {self.processes} inference processes"
+        )
+
+        try:
+            while True:
+                connection = listener.accept()
+                threading.Thread(
+                    target=self._handle_connection,
+                    args=(connection,),
+                    daemon=True,
+                ).start()
+        finally:
+            listener.close()
+            self._pool.shutdown(cancel_futures=True)
+
+    def _handle_connection(self: Self, connection) -> None:
+        with connection:
+            while True:
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):
+                    return
+                if request.get("readiness"):
+                    connection.send(self._readiness)
+                    continue
+                try:
+                    response = self._submit(request)
+                except Exception as e:
+                    logger.error(f"Model server inference failed: {str(e)}")
+                    response = {"error": str(e), "error_type": type(e).__name__}
+                connection.send(response)
+
+    def _submit(self: Self, request: dict) -> dict:
+        pool = self._pool
+        try:
+            return pool.submit(_run_inference, request).result()
+        except BrokenProcessPool:
+            # Un processus d'inférence est mort (OOM, ...) : le pool entier
+            # est inutilisable, on le reconstruit et on rejoue la requête
+            # une fois.
+            logger.error("Model server: inference pool broken, restarting it")
+            return self._restart_pool(pool).submit(_run_inference, request).result()
+
+    def _restart_pool(self: Self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            # Déjà reconstruit par une autre connexion.
+            if self._pool is not broken:
+                return self._pool
+            self._readiness = {"ready": False, "processes": []}
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._start_pool()
+            return self._pool
+
+
+service_model_server: Service_MODEL_SERVER = Service_MODEL_SERVER()
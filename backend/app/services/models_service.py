@@ -1,83 +1,314 @@
 import base64
+import threading
+import time
 from typing import Self
-from backend.app.core.const.enum import ENUM_MODELS_TYPE, ENUM_MODELS_ENV, ENUM_CLASSES
+from backend.app.core.const.enum import (
+    ENUM_MODELS_TYPE,
+    ENUM_MODELS_ENV,
+    ENUM_CLASSES,
+    ENUM_MODELS_SERVED,
+)
 from backend.app.exeptions import ModelTypeNotFoundError
+from backend.app.services.cache_service import service_cache
+from backend.app.services.detector_service import service_detector
+from backend.app.services.image_service import service_image
+from backend.app.services.metrics_service import service_metrics
+from backend.app.services.onnx_service import service_onnx
+from backend.app.services.preprocess_service import (
+    build_batch,
+    crop_resize,
+    face_regions,
+    input_shape,
+)
+from backend.app.services.scheduler_service import (
+    Service_SCHEDULER,
+    is_scheduler_enabled,
+)
+from backend.app.services.timing_service import service_timing
 import numpy as np
-import tensorflow as tf
 import os
 from dotenv import load_dotenv
-from PIL import Image
-import face_recognition
-import io
-import torch
-import torchvision.transforms as transforms
-from PIL import Image
-from facenet_pytorch import MTCNN
-from ultralytics import YOLO
 
 load_dotenv()
 
 
 class Service_MODEL:
 
+    # Entrée (spec de prétraitement) de chaque passage avant, par type.
+    FORWARD_SPECS: dict[str, dict[str, str]] = {
+        ENUM_MODELS_TYPE.GENDER_SCRATCH.value: {"main": "gender"},
+        ENUM_MODELS_TYPE.AGE_SCRATCH.value: {"main": "age"},
+        ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value: {"main": "gender_age"},
+        ENUM_MODELS_TYPE.GENDER_AND_AGE_TRANSFER.value: {
+            "main": "gender_age_transfer"
+        },
+        ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value: {
+            "age": "efficientnet",
+            "ethnicity": "efficientnet",
+            "gender": "gender",
+        },
+    }
+
     _model = None
 
     _ethnieModel: dict = {}
 
     def __init__(self: Self, typeModel: str) -> None:
-        if typeModel not in (
-            [
-                ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value,
-                ENUM_MODELS_TYPE.GENDER_SCRATCH.value,
-                ENUM_MODELS_TYPE.AGE_SCRATCH.value,
-                ENUM_MODELS_TYPE.GENDER_AND_AGE_TRANSFER.value,
-                ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value,
-            ]
-        ):
+        if typeModel not in ENUM_MODELS_SERVED.TYPES.value:
             raise ModelTypeNotFoundError(typeModel)
         self._typeModel = typeModel
 
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.map_location = torch.device(self.device)
-        self.mtcnn = MTCNN(
-            image_size=224, margin=20, keep_all=False, device=self.device
-        )
-
+        # tensorflow, torch et ultralytics ne sont importés qu'au chargement
+        # d'un modèle qui en a besoin (démarrage rapide des routes /auth et
+        # /user, mode API_ONLY).
         match typeModel:
+            case ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
+                from ultralytics import YOLO
+
+                self.model_yolo = YOLO(
+                    os.environ.get(ENUM_MODELS_ENV.PATH_YOLO.value)
+                ).to(self.device)
+                self._ethnieModel.update(self.initEthnieModels())
+            case _ if service_onnx.enabled:
+                # Les passages avant sont servis par onnxruntime (initForwards).
+                pass
             case ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value:
-                self._model = tf.keras.models.load_model(
-                    str(os.environ.get(ENUM_MODELS_ENV.PATH_GENDER_AGE_MODEL.value))
+                self._model = self.load_keras(
+                    os.environ.get(ENUM_MODELS_ENV.PATH_GENDER_AGE_MODEL.value)
                 )
             case ENUM_MODELS_TYPE.GENDER_SCRATCH.value:
-                self.initGenderScratch()
+                self._model = self.initGenderScratch()
             case ENUM_MODELS_TYPE.AGE_SCRATCH.value:
-                self._model = tf.keras.models.load_model(
-                    str(os.environ.get(ENUM_MODELS_ENV.PATH_AGE_MODEL.value))
+                self._model = self.load_keras(
+                    os.environ.get(ENUM_MODELS_ENV.PATH_AGE_MODEL.value)
                 )
             case ENUM_MODELS_TYPE.GENDER_AND_AGE_TRANSFER.value:
-                self._model = tf.keras.models.load_model(
-                    str(
-                        os.environ.get(ENUM_MODELS_ENV.PATH_GENDER_AGE_FINETUNING.value)
-                    )
+                self._model = self.load_keras(
+                    os.environ.get(ENUM_MODELS_ENV.PATH_GENDER_AGE_FINETUNING.value)
                 )
-            case ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
-                self.model_yolo = YOLO(
-                    os.environ.get(ENUM_MODELS_ENV.PATH_YOLO.value)
-                ).to(self.device)
-                self._ethnieModel.update(self.initEthnieModels())
+
+        self._stats_lock = threading.Lock()
+        self._faces_count = 0
+        self._gender_fallback_count = 0
+
+        self._forwards = self.initForwards()
+        self._schedulers = (
+            {
+                name: Service_SCHEDULER(f"{typeModel}.{name}", forward)
+                for name, forward in self._forwards.items()
+            }
+            if is_scheduler_enabled()
+            else {}
+        )
+
+    def native_models(self) -> dict:
+        # Modèle Keras ou torch derrière chaque passage avant (backend natif).
+        if self._typeModel == ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
+            return {
+                name: self._ethnieModel[key]
+                for name, key in (
+                    ("age", "age_model"),
+                    ("ethnicity", "ethnicity_model"),
+                    ("gender", "gender_model"),
+                )
+                if key in self._ethnieModel
+            }
+        return {"main": self._model}
+
+    def initForwards(self) -> dict:
+        native_models = self.native_models()
+        forwards = {}
+        for name in self.FORWARD_SPECS[self._typeModel]:
+            if service_onnx.serves(self._typeModel, name):
+                forwards[name] = service_onnx.load_forward(self._typeModel, name)
+            elif hasattr(native_models[name], "predict"):
+                spec_name = self.FORWARD_SPECS[self._typeModel][name]
+                forwards[name] = self.keras_forward(native_models[name], spec_name)
+            else:
+                forwards[name] = self.torch_forward(native_models[name])
+        return forwards
+
+    @property
+    def device(self) -> str:
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @property
+    def map_location(self):
+        import torch
+
+        return torch.device(self.device)
+
+    def load_keras(self, path: str):
+        import tensorflow as tf
+
+        return tf.keras.models.load_model(str(path))
+
+    def keras_forward(self, model, spec_name: str):
+        import tensorflow as tf
+
+        if os.environ.get(ENUM_MODELS_ENV.KERAS_COMPILED.value, "1") != "1":
+
+            def forward(batch: np.ndarray):
+                return model.predict(batch, batch_size=len(batch), verbose=0)
+
+            return forward
+
+        infer = self.compile_keras(
+            model,
+            spec_name,
+            os.environ.get(ENUM_MODELS_ENV.KERAS_JIT_COMPILE.value, "0") == "1",
+        )
+
+        def forward(batch: np.ndarray):
+            outputs = infer(tf.convert_to_tensor(batch))
+            return tf.nest.map_structure(lambda output: output.numpy(), outputs)
+
+        return forward
+
+    def compile_keras(self, model, spec_name: str, jit_compile: bool = False):
+        import tensorflow as tf
+
+        # model.predict reconstruit un data adapter et une boucle à chaque
+        # appel, coûteux pour un seul visage : on trace une fois, au
+        # chargement, un appel direct au modèle avec une signature fixe
+        # (taille de lot libre). Avec XLA, chaque nouvelle taille de lot
+        # déclenche en revanche une compilation.
+        signature = [
+            tf.TensorSpec((None, *input_shape(spec_name, 1)[1:]), tf.float32)
+        ]
+
+        @tf.function(input_signature=signature, jit_compile=jit_compile)
+        def infer(batch):
+            return model(batch, training=False)
+
+        infer.get_concrete_function()
+        return infer
+
+    def torch_forward(self, model):
+        import torch
+
+        device = self.device
+
+        def forward(batch: np.ndarray) -> np.ndarray:
+            with torch.inference_mode():
+                return model(torch.from_numpy(batch).to(device)).cpu().numpy()
+
+        return forward
+
+    def forward(self, name: str, batch: np.ndarray):
+        # Passe par le scheduler (micro-batching inter-requêtes) s'il est actif.
+        with service_timing.stage("forward", self._typeModel):
+            if name in self._schedulers:
+                return self._schedulers[name].submit(batch)
+            return self._forwards[name](batch)
+
+    def preprocess(self, image: np.ndarray, regions: list, spec_name: str):
+        with service_timing.stage("preprocess", self._typeModel):
+            return build_batch(image, regions, spec_name)
+
+    def warm_up(self, batch_sizes: list[int]) -> float:
+        # Passages à vide (hors scheduler) pour déclencher le traçage des
+        # graphes TF/torch et la sélection des noyaux avant le premier client.
+        start = time.perf_counter()
+        for batch_size in batch_sizes:
+            for name, spec_name in self.FORWARD_SPECS[self._typeModel].items():
+                self._forwards[name](
+                    np.zeros(input_shape(spec_name, batch_size), dtype=np.float32)
+                )
+            if self._typeModel == ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
+                self.predict_gender_yolo(
+                    [np.zeros((200, 200, 3), dtype=np.uint8)] * batch_size
+                )
+
+        service_detector.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+        return time.perf_counter() - start
+
+    def stats(self) -> dict:
+        stats = {
+            "backend": {
+                name: service_onnx.describe(self._typeModel, name)
+                for name in self._forwards
+            },
+            "schedulers": {
+                name: scheduler.stats() for name, scheduler in self._schedulers.items()
+            }
+        }
+        if self._typeModel == ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
+            with self._stats_lock:
+                stats["gender_fallback"] = {
+                    "faces": self._faces_count,
+                    "fallbacks": self._gender_fallback_count,
+                    "rate": (
+                        round(self._gender_fallback_count / self._faces_count, 4)
+                        if self._faces_count
+                        else 0.0
+                    ),
+                }
+        return stats
 
     def handle_prediction(self: Self, imageFile) -> str:
+        return self.handle_prediction_bytes(service_image.read_upload(imageFile))
+
+    def handle_prediction_bytes(self: Self, data: bytes) -> str:
+        return service_cache.get_or_compute(
+            data,
+            self._typeModel,
+            lambda: self.predict_image(service_image.decode(data)),
+        )
+
+    def predict_image(self: Self, image: np.ndarray) -> str:
+        return self.predict_regions(image, self.extract_faces(image))
+
+    def predict_regions(self: Self, image: np.ndarray, regions: list | str) -> str:
+        if isinstance(regions, str):
+            return regions
+
         if self._typeModel == ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
-            return self.get_prediction_with_ethnicity(imageFile)
+            return self.get_prediction_with_ethnicity(image, regions)
         else:
-            return self.get_prediction(imageFile)
+            return self.get_prediction(image, regions)
 
-    def predict_gender_yolo(self, face_image):
-        results = self.model_yolo(face_image)
+    def predict_faces(self: Self, image: np.ndarray, regions: list) -> list[dict]:
+        # Résultat structuré par visage (flux webcam), plutôt qu'un message.
+        if self._typeModel == ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value:
+            gender_results, age_results, ethnicity_results = (
+                self.get_attributes_with_ethnicity(image, regions)
+            )
+        else:
+            gender_results, age_results = self.get_attributes(image, regions)
+            ethnicity_results = []
+
+        faces = []
+        for index, (top, bottom, left, right) in enumerate(regions):
+            face = {
+                "box": {
+                    "top": int(top),
+                    "right": int(right),
+                    "bottom": int(bottom),
+                    "left": int(left),
+                }
+            }
+            if gender_results:
+                face["gender"] = gender_results[index]
+            if age_results:
+                face["age"] = int(age_results[index])
+                face["age_range"] = self.categorize_age(age_results[index])
+            if ethnicity_results:
+                face["ethnicity"] = ethnicity_results[index]
+            faces.append(face)
+        return faces
+
+    def predict_gender_yolo(self, face_images) -> list[tuple[str, float]]:
+        with service_timing.stage("forward", self._typeModel):
+            results = self.model_yolo(face_images, verbose=False)
 
         CONFIDENCE_THRESHOLD = 0.4
 
+        predictions = []
         for result in results:
+            prediction = ("Inconnu", 0.0)
             for box in result.boxes:
                 class_id = int(box.cls[0].item())
                 confidence = box.conf[0].item()
@@ -85,45 +316,56 @@ class Service_MODEL:
                 if confidence < CONFIDENCE_THRESHOLD:
                     continue
 
-                return (
+                prediction = (
                     ENUM_CLASSES.CLASS_NAMES_GENDER.value.get(class_id, "Inconnu"),
                     confidence,
                 )
+                break
+            predictions.append(prediction)
 
-        return "Inconnu", 0.0
+        return predictions
 
-    def initGenderScratch(self) -> None:
-        self._model = tf.keras.models.load_model(
-                str(os.environ.get(ENUM_MODELS_ENV.PATH_GENDER_MODEL.value))
-        )
+    def initGenderScratch(self):
+        return self.load_keras(os.environ.get(ENUM_MODELS_ENV.PATH_GENDER_MODEL.value))
 
-    def get_prediction(self: Self, imageFile) -> str:
-        cropped_faces = self.loadImageFile(imageFile)
-        if isinstance(cropped_faces, str):
-            return cropped_faces
+    def get_prediction(self: Self, image: np.ndarray, regions: list) -> str:
+        gender_results, age_results = self.get_attributes(image, regions)
+        with service_timing.stage("format", self._typeModel):
+            return self.build_message(len(regions), gender_results, age_results)
+
+    def get_attributes(
+        self: Self, image: np.ndarray, regions: list
+    ) -> tuple[list, list]:
         gender_results = []
         age_results = []
 
-        for face_image in cropped_faces:
-            match self._typeModel:
-                case ENUM_MODELS_TYPE.GENDER_SCRATCH.value:
-                    gender, _ = self.predict_gender(face_image)
-                    gender_results.append(gender)
-                case ENUM_MODELS_TYPE.AGE_SCRATCH.value:
-                    age, _ = self.predict_age(face_image)
-                    age_results.append(age)
-                case ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value:
-                    gender, age = self.predict_gender_age(face_image)
+        match self._typeModel:
+            case ENUM_MODELS_TYPE.GENDER_SCRATCH.value:
+                gender_results = [
+                    gender for gender, _ in self.predict_gender(image, regions)
+                ]
+            case ENUM_MODELS_TYPE.AGE_SCRATCH.value:
+                age_results = [age for age, _ in self.predict_age(image, regions)]
+            case ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value:
+                for gender, age in self.predict_gender_age(image, regions):
                     gender_results.append(gender)
                     age_results.append(age)
-                case ENUM_MODELS_TYPE.GENDER_AND_AGE_TRANSFER.value:
-                    gender, age = self.predict_gender_age_transfer(face_image)
+            case ENUM_MODELS_TYPE.GENDER_AND_AGE_TRANSFER.value:
+                for gender, age in self.predict_gender_age_transfer(image, regions):
                     gender_results.append(gender)
                     age_results.append(age)
-                case _:
-                    raise ModelTypeNotFoundError(self._typeModel)
-
-        num_faces = len(cropped_faces)
+            case _:
+                raise ModelTypeNotFoundError(self._typeModel)
+
+        return gender_results, age_results
+
+    def build_message(
+        self: Self,
+        num_faces: int,
+        gender_results: list,
+        age_results: list,
+        ethnicity_results: list | None = None,
+    ) -> str:
         avg_age = int(np.mean(age_results)) if age_results else None
 
         if num_faces == 1:
@@ -156,6 +398,14 @@ class Service_MODEL:
                     f"L'âge moyen des visages détectés est d'environ {avg_age} ans.\n"
                 )  
 
+        if ethnicity_results:
+            if num_faces == 1:
+                message += f"Elle semble être d'origine {ethnicity_results[0]}.\n"
+            else:
+                message += (
+                    "Origines détectées : " + ", ".join(ethnicity_results) + ".\n"
+                )
+
         if len(gender_results) > 1:
             message += (
                 f"Répartition des genres : {self.get_gender_average(gender_results)}.\n"
@@ -163,7 +413,8 @@ class Service_MODEL:
 
         return message
 
-    def categorize_age(self, age):
+    @staticmethod
+    def categorize_age(age):
         if age <= 10:
             return "0 - 10 ans"
         elif age <= 20:
@@ -187,99 +438,69 @@ class Service_MODEL:
         else:
             return "101 - 120 ans"
 
-    def get_prediction_with_ethnicity(self: Self, imageFile) -> str:
-        cropped_faces = self.loadImageFile(imageFile)
-
-        if isinstance(cropped_faces, str):
-            return cropped_faces
-
-        age_model = self._ethnieModel["age_model"]
-        ethnicity_model = self._ethnieModel["ethnicity_model"]
-
-        age_transform, ethnicity_transform = self.getFeaturesTransfor()
-
-        gender_results, age_results, ethnicity_results = [], [], []
-
-        for face in cropped_faces:
-            face_pil = face.convert("RGB")
-
-            face_age = age_transform(face_pil).unsqueeze(0).to(self.device)
-            with torch.no_grad():
-                age_pred = round(age_model(face_age).item())
-            age_results.append(age_pred)
-
-            gender_pred, _ = self.predict_gender_yolo(face_pil)
-            if gender_pred == "Inconnu":
-                self.initGenderScratch()
-                gender_pred, _ = self.predict_gender(face)
-            gender_results.append(gender_pred)
-
-            face_ethnicity = ethnicity_transform(face_pil).unsqueeze(0).to(self.device)
-            with torch.no_grad():
-                ethnicity_outputs = ethnicity_model(face_ethnicity)
-                _, ethnicity_class = torch.max(ethnicity_outputs, 1)
-            ethnicity_pred = ENUM_CLASSES.ETHNICITY.value[ethnicity_class.item()]
-            ethnicity_results.append(ethnicity_pred)
-
-        num_faces = len(cropped_faces)
-        avg_age = int(np.mean(age_results)) if age_results else None
-
-        if num_faces == 1:
-            message = "J'ai détecté un visage sur cette image.\n"
-        else:
-            message = f"J'ai trouvé {num_faces} visages sur cette image.\n"
-
-        if gender_results:
-            if num_faces == 1:
-                message += f"La personne semble être un(e) {gender_results[0]}.\n"
-            else:
-                message += (
-                    "Voici les genres détectés : " + ", ".join(gender_results) + ".\n"
-                )
-
-       
-        if avg_age is not None:
-            if num_faces == 1 :    
-                message += (
-                    "Voici la tranche d'âge que j'ai trouvée : \n"
-                    + self.categorize_age(age_results[0])
-                    + ".\n"
-                )
-            else :
-                message += (
-                    "Voici les tranches d'âge que j'ai trouvées : \n" +
-                    ", ".join(map(self.categorize_age, age_results))
-                    + ".\n"
-                )          
-                message += (
-                    f"L'âge moyen des visages détectés est d'environ {avg_age} ans.\n"
-                )  
+    def get_prediction_with_ethnicity(
+        self: Self, image: np.ndarray, regions: list
+    ) -> str:
+        results = self.get_attributes_with_ethnicity(image, regions)
+        with service_timing.stage("format", self._typeModel):
+            return self.build_message(len(regions), *results)
+
+    def get_attributes_with_ethnicity(
+        self: Self, image: np.ndarray, regions: list
+    ) -> tuple[list, list, list]:
+        # Les deux modèles partagent la même entrée 224x224 normalisée : le
+        # lot est construit une seule fois.
+        batch = self.preprocess(image, regions, "efficientnet")
+
+        age_outputs = self.forward("age", batch)
+        ethnicity_outputs = self.forward("ethnicity", batch)
+
+        age_results = [round(float(age)) for age in age_outputs[:, 0]]
+        ethnicity_results = [
+            ENUM_CLASSES.ETHNICITY.value[ethnicity_class]
+            for ethnicity_class in ethnicity_outputs.argmax(axis=1).tolist()
+        ]
 
-        if ethnicity_results:
-            if num_faces == 1:
-                message += f"Elle semble être d'origine {ethnicity_results[0]}.\n"
-            else:
-                message += (
-                    "Origines détectées : " + ", ".join(ethnicity_results) + ".\n"
-                )
+        # YOLO attend des tableaux BGR.
+        with service_timing.stage("preprocess", self._typeModel):
+            faces_bgr = [
+                np.ascontiguousarray(face[..., ::-1])
+                for face in crop_resize(image, regions, (200, 200))
+            ]
+        gender_results = [gender for gender, _ in self.predict_gender_yolo(faces_bgr)]
 
-        if len(gender_results) > 1:
-            message += (
-                f"Répartition des genres : {self.get_gender_average(gender_results)}.\n"
+        # Repli sur le modèle de genre Keras, en un seul lot, pour les visages
+        # que YOLO n'a pas su classer.
+        fallback_indexes = [
+            index for index, gender in enumerate(gender_results) if gender == "Inconnu"
+        ]
+        if fallback_indexes:
+            fallback_predictions = self.predict_gender(
+                image, [regions[index] for index in fallback_indexes], "gender"
             )
+            for index, (gender, _) in zip(fallback_indexes, fallback_predictions):
+                gender_results[index] = gender
+
+        with self._stats_lock:
+            self._faces_count += len(regions)
+            self._gender_fallback_count += len(fallback_indexes)
+        service_metrics.count_gender_fallback(
+            self._typeModel, len(regions), len(fallback_indexes)
+        )
 
-        return message
-
-    def loadImageFile(self, imageFile) -> list:
+        return gender_results, age_results, ethnicity_results
 
-        image = Image.open(io.BytesIO(imageFile.read()))
+    def extract_faces(self, image: np.ndarray) -> list | str:
+        with service_timing.stage("detect", self._typeModel):
+            face_locations = self.detect_faces(image)
 
-        face_locations = self.detect_faces(image)
+        with service_timing.stage("crop_faces", self._typeModel):
+            regions = face_regions(image.shape, face_locations or [])
 
-        if not face_locations:
+        if not regions:
             return "Je n'ai détecté aucun visage sur cette image. Assurez-vous qu'il est bien visible et réessayez !"
 
-        return self.crop_faces(image, face_locations)
+        return regions
 
     def get_gender_average(self, gender_results):
         female_count = gender_results.count("Femme")
@@ -292,116 +513,60 @@ class Service_MODEL:
             f"Femme : {female_percentage:.2f}%, Homme : {100 - female_percentage:.2f}%"
         )
 
-    def ensure_8bit(self, image):
-        image_array = np.array(image)
-        if image_array.dtype != np.uint8:
-            image_array = (image_array / (image_array.max() / 255)).astype(np.uint8)
-            image = Image.fromarray(image_array, mode=image.mode)
-
-        if image.mode not in ["RGB", "L"]:
-            image = image.convert("RGB")
-
-        return image
-
-    def detect_faces(self, image):
-        image = self.ensure_8bit(image)
-        image_array = np.array(image)
-        face_locations = face_recognition.face_locations(image_array)
-        return face_locations
-
-    def crop_faces(
-        self, image, face_locations, target_size=(200, 200), margin_ratio=0.1
-    ):
-        cropped_faces = []
-        img_width, img_height = image.size
-
-        if len(face_locations) == 1:
-            top, right, bottom, left = face_locations[0]
-            face_width = right - left
-            face_height = bottom - top
-            if img_width == 200 and img_height == 200:
-                if 120 <= face_width <= 160 and 120 <= face_height <= 160:
-                    return [image]
-
-        for _, (top, right, bottom, left) in enumerate(face_locations):
-            face_width = right - left
-            face_height = bottom - top
-
-            margin_width = int(face_width * margin_ratio)
-            margin_height = int(face_height * margin_ratio)
-
-            new_left = max(0, left - margin_width)
-            new_top = max(0, top - margin_height)
-            new_right = min(img_width, right + margin_width)
-            new_bottom = min(img_height, bottom + margin_height)
-
-            face_image = image.crop((new_left, new_top, new_right, new_bottom))
-            face_image = face_image.resize(target_size, Image.Resampling.LANCZOS)
-
-            cropped_faces.append(face_image)
-
-        return cropped_faces
-
-    def preprocess_gender(self, face_image):
-        image_gray = face_image.convert("L").resize((100, 100))
-        image_array = np.array(image_gray) / 255.0
-        return np.expand_dims(np.expand_dims(image_array, axis=0), axis=-1)
-
-    def preprocess_age(self, face_image):
-        image_gray = face_image.convert("L").resize((128, 128))
-        image_array = np.array(image_gray) / 255.0
-        return np.expand_dims(np.expand_dims(image_array, axis=0), axis=-1)
-
-    def preprocess_gender_age(self, face_image):
-        image_gray = face_image.convert("RGB").resize((200, 200))
-        image_array = np.array(image_gray) / 255.0
-        image_array = np.expand_dims(image_array, axis=0)
-        return image_array
-
-    def preprocess_gender_age_transfer(self, face_image):
-        image = face_image.resize((180, 180))
-        if image.mode == "RGBA":
-            image = image.convert("RGB")
-        return np.array(image)
-
-    def predict_gender(self, face_image):
-        processed_image = self.preprocess_gender(face_image)
-        prediction = self._model.predict(processed_image)
-        return "Homme" if prediction[0][0] > 0.5 else "Femme", float(prediction[0][0])
-
-    def predict_age(self, face_image):
-        processed_image = self.preprocess_age(face_image)
-        prediction = self._model.predict(processed_image)
-        return int(round(prediction[0][0] * 116)), float(prediction[0][0])
-
-    def predict_gender_age(self, face_image):
-        processed_image = self.preprocess_gender_age(face_image)
-        gender_age_prediction = self._model.predict(processed_image)
-        predicted_gender = ENUM_CLASSES.CLASS_NAMES_GENDER.value[
-            round(gender_age_prediction[0][0][0])
+    def detect_faces(self, image: np.ndarray):
+        return service_detector.detect(image)
+
+    def predict_batch(self, batch: np.ndarray, name: str = "main"):
+        # Un seul passage avant pour tous les visages de l'image.
+        return self.forward(name, batch)
+
+    def predict_gender(
+        self, image: np.ndarray, regions: list, name: str = "main"
+    ) -> list[tuple[str, float]]:
+        predictions = self.predict_batch(self.preprocess(image, regions, "gender"), name)
+        return [
+            ("Homme" if prediction[0] > 0.5 else "Femme", float(prediction[0]))
+            for prediction in predictions
         ]
-        predicted_age = round(gender_age_prediction[1][0][0])
-        return predicted_gender, predicted_age
-
-    def predict_gender_age_transfer(self, face_image):
-        image = self.preprocess_gender_age_transfer(face_image)
-        prediction = self._model.predict(np.expand_dims(image, axis=0))
-        age, gender = round(prediction[0][0][0]), round(prediction[1][0][0])
-        return ENUM_CLASSES.CLASS_NAMES_GENDER.value.get(gender), age
-
-    def getFeaturesTransfor(self) -> tuple:
-
-        age_transform = ethnicity_transform = transforms.Compose(
-            [
-                transforms.Resize((224, 224)),
-                transforms.ToTensor(),
-                transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225]),
-            ]
+
+    def predict_age(self, image: np.ndarray, regions: list) -> list[tuple[int, float]]:
+        predictions = self.predict_batch(self.preprocess(image, regions, "age"))
+        return [
+            (int(round(prediction[0] * 116)), float(prediction[0]))
+            for prediction in predictions
+        ]
+
+    def predict_gender_age(
+        self, image: np.ndarray, regions: list
+    ) -> list[tuple[str, int]]:
+        gender_predictions, age_predictions = self.predict_batch(
+            self.preprocess(image, regions, "gender_age")
         )
+        return [
+            (
+                ENUM_CLASSES.CLASS_NAMES_GENDER.value[round(gender[0])],
+                round(age[0]),
+            )
+            for gender, age in zip(gender_predictions, age_predictions)
+        ]
 
-        return age_transform, ethnicity_transform
+    def predict_gender_age_transfer(
+        self, image: np.ndarray, regions: list
+    ) -> list[tuple[str, int]]:
+        age_predictions, gender_predictions = self.predict_batch(
+            self.preprocess(image, regions, "gender_age_transfer")
+        )
+        return [
+            (
+                ENUM_CLASSES.CLASS_NAMES_GENDER.value.get(round(gender[0])),
+                round(age[0]),
+            )
+            for age, gender in zip(age_predictions, gender_predictions)
+        ]
 
     def load_ckpt_weights(self, model, ckpt_path, device="cpu"):
+        import torch
+
         checkpoint = torch.load(ckpt_path, map_location=torch.device(device))
 
         if "state_dict" in checkpoint:
@@ -419,6 +584,7 @@ class Service_MODEL:
         return model
 
     def initAgeModel(self):
+        import torch
         from timm import create_model
 
         age_model = create_model("tf_efficientnetv2_m", pretrained=False, num_classes=1)
@@ -433,6 +599,7 @@ class Service_MODEL:
         return age_model
 
     def initEthnieModel(self):
+        import torch
         from timm import create_model
 
         num_classes = 5
@@ -450,9 +617,18 @@ class Service_MODEL:
         return model
 
     def initEthnieModels(self) -> dict:
+        # Les passages servis par onnxruntime (MODELS_BACKEND=onnx ou INT8)
+        # ne chargent pas leur modèle natif.
+        eagt = ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value
+        models = {}
+
+        if not service_onnx.serves(eagt, "age"):
+            models["age_model"] = self.initAgeModel()
 
-        age_model = self.initAgeModel()
+        if not service_onnx.serves(eagt, "ethnicity"):
+            models["ethnicity_model"] = self.initEthnieModel()
 
-        ethnicity_model = self.initEthnieModel()
+        if not service_onnx.serves(eagt, "gender"):
+            models["gender_model"] = self.initGenderScratch()
 
-        return {"age_model": age_model, "ethnicity_model": ethnicity_model}
+        return models
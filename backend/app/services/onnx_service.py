@@ -0,0 +1,112 @@
+import os
+from typing import Self
+import numpy as np
+from dotenv import load_dotenv
+from backend.app.core.const.enum import (
+    ENUM_MODELS_BACKEND,
+    ENUM_MODELS_TYPE,
+    ENUM_ONNX_ENV,
+)
+from backend.app.log import logger
+
+load_dotenv()
+
+
+class Service_ONNX:
+    """
+    Exécution des modèles exportés au format ONNX avec onnxruntime.
+
+    Les fichiers sont produits par backend/tools/export_onnx.py sous
+    ONNX_MODELS_DIR/<type>.<passage>.onnx ; onnxruntime n'est importé
+    que lorsque ce backend est choisi (MODELS_BACKEND=onnx).
+
+    ONNX_INT8_ENABLED=1 sert en plus les passages de INT8_FORWARDS avec
+    leur version quantifiée <type>.<passage>.int8.onnx (produite par
+    backend/tools/quantize_int8.py), y compris avec le backend natif.
+    """
+
+    # Passages avant dont une version INT8 peut remplacer le modèle fp32.
+    INT8_FORWARDS: dict[str, tuple[str, ...]] = {
+        ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value: ("age", "ethnicity"),
+    }
+
+    def __init__(self: Self) -> None:
+        self.backend = os.environ.get(
+            ENUM_ONNX_ENV.BACKEND.value, ENUM_MODELS_BACKEND.NATIVE.value
+        )
+        self.models_dir = os.environ.get(ENUM_ONNX_ENV.MODELS_DIR.value, "model/onnx")
+        self.intra_op_threads = int(
+            os.environ.get(ENUM_ONNX_ENV.INTRA_OP_THREADS.value, 0)
+        )
+        self.inter_op_threads = int(
+            os.environ.get(ENUM_ONNX_ENV.INTER_OP_THREADS.value, 1)
+        )
+        self.int8 = os.environ.get(ENUM_ONNX_ENV.INT8_ENABLED.value, "0") == "1"
+
+    @property
+    def enabled(self: Self) -> bool:
+        return self.backend == ENUM_MODELS_BACKEND.ONNX.value
+
+    def is_int8(self: Self, typeModel: str, name: str) -> bool:
+        return self.int8 and name in self.INT8_FORWARDS.get(typeModel, ())
+
+    def serves(self: Self, typeModel: str, name: str) -> bool:
+        return self.enabled or self.is_int8(typeModel, name)
+
+    def describe(self: Self, typeModel: str, name: str) -> str:
+        if self.is_int8(typeModel, name):
+            return "onnx-int8"
+        return "onnx" if self.enabled else ENUM_MODELS_BACKEND.NATIVE.value
+
+    def path(self: Self, typeModel: str, name: str, int8: bool = False) -> str:
+        suffix = ".int8.onnx" if int8 else ".onnx"
+        return os.path.join(self.models_dir, f"{typeModel}.{name}{suffix}")
+
+    def session_options(self: Self):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # 0 laisse onnxruntime utiliser un thread par cœur physique.
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.enable_cpu_mem_arena = True
+        options.enable_mem_pattern = True
+        return options
+
+    def session(self: Self, path: str):
+        import onnxruntime as ort
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"{path} introuvable : lancer python -m backend.tools.export_onnx"
+            )
+
+        session = ort.InferenceSession(
+            path,
+            sess_options=self.session_options(),
+            providers=["CPUExecutionProvider"],
+        )
+        logger.info(f"ONNX session loaded from {path}")
+        return session
+
+    def forward(self: Self, session):
+        input_name = session.get_inputs()[0].name
+
+        def forward(batch: np.ndarray):
+            outputs = session.run(None, {input_name: batch})
+            # Même forme de retour que model.predict : une liste pour les
+            # modèles multi-sorties, un tableau sinon.
+            return outputs[0] if len(outputs) == 1 else outputs
+
+        return forward
+
+    def load_path(self: Self, path: str):
+        return self.forward(self.session(path))
+
+    def load_forward(self: Self, typeModel: str, name: str):
+        return self.load_path(self.path(typeModel, name, self.is_int8(typeModel, name)))
+
+
+service_onnx: Service_ONNX = Service_ONNX()
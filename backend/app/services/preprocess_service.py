@@ -0,0 +1,103 @@
+import cv2
+import numpy as np
+
+# Région d'un visage dans l'image source : (top, bottom, left, right).
+Region = tuple[int, int, int, int]
+
+# Entrée attendue par chaque modèle : taille (largeur, hauteur), niveaux de gris
+# ou RGB, facteur d'échelle, normalisation éventuelle et ordre des canaux.
+PREPROCESS_SPECS: dict[str, dict] = {
+    "gender": {"size": (100, 100), "gray": True, "scale": 1 / 255},
+    "age": {"size": (128, 128), "gray": True, "scale": 1 / 255},
+    "gender_age": {"size": (200, 200), "gray": False, "scale": 1 / 255},
+    "gender_age_transfer": {"size": (180, 180), "gray": False, "scale": 1.0},
+    "efficientnet": {
+        "size": (224, 224),
+        "gray": False,
+        "scale": 1 / 255,
+        "mean": (0.485, 0.456, 0.406),
+        "std": (0.229, 0.224, 0.225),
+        "channels_first": True,
+    },
+}
+
+# Coefficients ITU-R 601-2, identiques à la conversion PIL "L".
+GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def input_shape(spec_name: str, batch_size: int) -> tuple[int, ...]:
+    spec = PREPROCESS_SPECS[spec_name]
+    width, height = spec["size"]
+    channels = 1 if spec["gray"] else 3
+    if spec.get("channels_first"):
+        return (batch_size, channels, height, width)
+    return (batch_size, height, width, channels)
+
+
+def face_regions(
+    image_shape: tuple, face_locations: list, margin_ratio: float = 0.1
+) -> list[Region]:
+    img_height, img_width = image_shape[:2]
+
+    # Image déjà recadrée sur un visage (200x200) : on la garde entière.
+    if len(face_locations) == 1 and img_width == 200 and img_height == 200:
+        top, right, bottom, left = face_locations[0]
+        if 120 <= right - left <= 160 and 120 <= bottom - top <= 160:
+            return [(0, img_height, 0, img_width)]
+
+    regions = []
+    for top, right, bottom, left in face_locations:
+        margin_width = int((right - left) * margin_ratio)
+        margin_height = int((bottom - top) * margin_ratio)
+
+        region = (
+            max(0, top - margin_height),
+            min(img_height, bottom + margin_height),
+            max(0, left - margin_width),
+            min(img_width, right + margin_width),
+        )
+        # Boîte réduite à rien une fois bornée à l'image : cv2.resize
+        # échouerait sur ce recadrage vide.
+        if region[1] > region[0] and region[3] > region[2]:
+            regions.append(region)
+    return regions
+
+
+def crop_resize(
+    image: np.ndarray, regions: list[Region], size: tuple[int, int]
+) -> np.ndarray:
+    # Les recadrages sont des vues sur l'image source : un seul redimensionnement
+    # par visage, écrit directement dans le lot uint8 (N, H, W, 3).
+    width, height = size
+    batch = np.empty((len(regions), height, width, 3), dtype=np.uint8)
+
+    for index, (top, bottom, left, right) in enumerate(regions):
+        crop = image[top:bottom, left:right]
+        interpolation = (
+            cv2.INTER_AREA
+            if crop.shape[0] >= height and crop.shape[1] >= width
+            else cv2.INTER_CUBIC
+        )
+        cv2.resize(crop, size, dst=batch[index], interpolation=interpolation)
+
+    return batch
+
+
+def build_batch(image: np.ndarray, regions: list[Region], spec_name: str) -> np.ndarray:
+    spec = PREPROCESS_SPECS[spec_name]
+    batch = crop_resize(image, regions, spec["size"]).astype(np.float32)
+
+    if spec["gray"]:
+        batch = (batch @ GRAY_WEIGHTS)[..., np.newaxis]
+
+    if spec["scale"] != 1.0:
+        batch *= np.float32(spec["scale"])
+
+    if "mean" in spec:
+        batch -= np.array(spec["mean"], dtype=np.float32)
+        batch /= np.array(spec["std"], dtype=np.float32)
+
+    if spec.get("channels_first"):
+        batch = batch.transpose(0, 3, 1, 2)
+
+    return np.ascontiguousarray(batch)
@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+from typing import Self
+import numpy as np
+from backend.app.core.const.enum import ENUM_MODELS_SERVED
+from backend.app.core.utility.utils import get_process_rss
+from backend.app.exeptions import ModelTypeNotFoundError
+from backend.app.log import logger
+from backend.app.services.cache_service import service_cache
+from backend.app.services.image_service import service_image
+from backend.app.services.metrics_service import service_metrics
+from backend.app.services.model_server_service import service_model_server
+from backend.app.services.models_service import Service_MODEL
+from backend.app.services.timing_service import service_timing
+
+
+class Service_REGISTRY:
+    def __init__(self: Self) -> None:
+        self._models: dict[str, Service_MODEL] = {}
+        self._stats: dict[str, dict] = {}
+        self._load_lock = threading.Lock()
+        self._expected: list[str] = []
+        self._warmup_expected = False
+
+        # Les modèles chargés avant un fork (gunicorn --preload) ne sont pas
+        # fiables dans l'enfant : chaque worker recharge les siens.
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self: Self) -> None:
+        self._models = {}
+        self._stats = {}
+        self._load_lock = threading.Lock()
+        self._expected = []
+        self._warmup_expected = False
+
+    def get(self: Self, typeModel: str) -> Service_MODEL:
+        model = self._models.get(typeModel)
+        if model is not None:
+            return model
+
+        self.check(typeModel)
+
+        with self._load_lock:
+            model = self._models.get(typeModel)
+            if model is None:
+                model = self._load(typeModel)
+        return model
+
+    def _load(self: Self, typeModel: str) -> Service_MODEL:
+        rss_before = get_process_rss()
+        start = time.perf_counter()
+
+        model = Service_MODEL(typeModel)
+
+        load_time = time.perf_counter() - start
+        rss_delta = max(0, get_process_rss() - rss_before)
+
+        self._stats[typeModel] = {
+            "load_time_s": round(load_time, 3),
+            "rss_bytes": rss_delta,
+            "loaded_at": time.time(),
+        }
+        self._models[typeModel] = model
+        service_metrics.set_load_time(typeModel, load_time)
+
+        logger.info(
+            f"Model '{typeModel}' loaded in {load_time:.2f}s - RSS +{rss_delta / 2**20:.1f} MiB"
+        )
+        return model
+
+    def parse_types(self: Self, typeModels: str | list[str] | None) -> list[str]:
+        if not typeModels:
+            return []
+        if isinstance(typeModels, str):
+            if typeModels.strip().lower() == "all":
+                return list(ENUM_MODELS_SERVED.TYPES.value)
+            return [t.strip() for t in typeModels.split(",") if t.strip()]
+        return list(typeModels)
+
+    def preload(self: Self, typeModels: str | list[str] | None) -> None:
+        for typeModel in self.parse_types(typeModels):
+            self.get(typeModel)
+
+    def initialise(
+        self: Self,
+        typeModels: str | list[str] | None,
+        warmup: str = "0",
+        batch_sizes: list[int] | None = None,
+    ) -> None:
+        # warmup : "0" (aucun), "1" (bloquant au démarrage) ou "background"
+        # (thread, /model/ready renvoie 503 tant qu'il n'est pas terminé).
+        self._expected = self.parse_types(typeModels)
+        self._warmup_expected = warmup in ("1", "background")
+
+        def run() -> None:
+            try:
+                self.preload(self._expected)
+            except Exception as e:
+                logger.error(f"Models preload failed: {str(e)}", exc_info=True)
+                if warmup != "background":
+                    raise
+                return
+            if self._warmup_expected:
+                self.warm_up(self._expected, batch_sizes or [1])
+
+        if warmup == "background":
+            threading.Thread(target=run, name="models-warmup", daemon=True).start()
+        else:
+            run()
+
+    def warm_up(
+        self: Self, typeModels: str | list[str] | None, batch_sizes: list[int]
+    ) -> None:
+        for typeModel in self.parse_types(typeModels):
+            try:
+                warmup_time = self.get(typeModel).warm_up(batch_sizes)
+            except Exception as e:
+                self._stats.setdefault(typeModel, {})["warmup_error"] = str(e)
+                logger.error(f"Model '{typeModel}' warm-up failed: {str(e)}")
+                continue
+
+            self._stats[typeModel]["warmup_time_s"] = round(warmup_time, 3)
+            self._stats[typeModel]["warmup_batch_sizes"] = batch_sizes
+            logger.info(f"Model '{typeModel}' warmed up in {warmup_time:.2f}s")
+
+    def readiness(self: Self) -> dict:
+        # Sans MODELS_PRELOAD, les modèles sont chargés à la première requête :
+        # rien à attendre.
+        if not self._expected:
+            return {"ready": True, "mode": "lazy", "models": {}}
+
+        models = {}
+        for typeModel in self._expected:
+            stats = self._stats.get(typeModel, {})
+            loaded = typeModel in self._models
+            warmed = "warmup_time_s" in stats
+            models[typeModel] = {
+                "loaded": loaded,
+                "warmed": warmed,
+                "ready": loaded and (warmed or not self._warmup_expected),
+                "load_time_s": stats.get("load_time_s"),
+                "warmup_time_s": stats.get("warmup_time_s"),
+            }
+        return {
+            "ready": all(model["ready"] for model in models.values()),
+            "mode": "preload",
+            "models": models,
+        }
+
+    def check(self: Self, typeModel: str) -> None:
+        if typeModel not in ENUM_MODELS_SERVED.TYPES.value:
+            raise ModelTypeNotFoundError(typeModel)
+
+    def handle_prediction(self: Self, typeModel: str, data: bytes) -> str:
+        return self.handle_multi_prediction(data, [typeModel])[typeModel]
+
+    def handle_multi_prediction(
+        self: Self, data: bytes, typeModels: list[str]
+    ) -> dict[str, str]:
+        # Valide tous les types avant de payer le décodage et la détection.
+        for typeModel in typeModels:
+            self.check(typeModel)
+
+        results: dict[str, str] = {}
+        keys: dict[str, str] = {}
+        for typeModel in typeModels:
+            if service_cache.enabled:
+                with service_timing.stage("cache", typeModel):
+                    keys[typeModel] = service_cache.key(data, typeModel)
+                    cached = service_cache.get(keys[typeModel])
+                if cached is not None:
+                    results[typeModel] = cached
+
+        missing = [typeModel for typeModel in typeModels if typeModel not in results]
+        if missing:
+            with service_timing.stage("decode", missing[0]):
+                image = service_image.decode(data)
+            if service_model_server.enabled:
+                computed = service_model_server.predict(image, missing)["results"]
+            else:
+                computed, _ = self.predict_image(image, missing)
+
+            for typeModel in missing:
+                results[typeModel] = computed[typeModel]
+                if typeModel in keys:
+                    service_cache.set(keys[typeModel], results[typeModel])
+
+        return {typeModel: results[typeModel] for typeModel in typeModels}
+
+    def predict_image(
+        self: Self, image: np.ndarray, typeModels: list[str]
+    ) -> tuple[dict[str, str], int]:
+        # Détection et recadrage une seule fois pour l'image, puis les mêmes
+        # régions sont envoyées à chaque modèle.
+        # Les étapes partagées sont attribuées au premier type demandé.
+        models = {typeModel: self.get(typeModel) for typeModel in typeModels}
+        regions = models[typeModels[0]].extract_faces(image)
+        faces = 0 if isinstance(regions, str) else len(regions)
+
+        results = {}
+        for typeModel, model in models.items():
+            service_metrics.observe_faces(typeModel, faces)
+            with service_timing.stage("predict", typeModel, report=False):
+                results[typeModel] = model.predict_regions(image, regions)
+        return results, faces
+
+    def is_loaded(self: Self, typeModel: str) -> bool:
+        return typeModel in self._models
+
+    def stats(self: Self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "process_rss_bytes": get_process_rss(),
+            "models": {
+                typeModel: {"loaded": typeModel in self._models}
+                | self._stats.get(typeModel, {})
+                | (
+                    self._models[typeModel].stats()
+                    if typeModel in self._models
+                    else {}
+                )
+                for typeModel in ENUM_MODELS_SERVED.TYPES.value
+            },
+            "cache": service_cache.stats(),
+        }
+
+
+service_registry: Service_REGISTRY = Service_REGISTRY()
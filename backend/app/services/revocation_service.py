@@ -0,0 +1,379 @@
+import datetime
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Self
+from dotenv import load_dotenv
+from redis import Redis
+from backend.app.core.const.enum import ENUM_REDIS_ENV, ENUM_REVOCATION_ENV
+from backend.app.exeptions import RevocationPropagationError
+from backend.app.log import logger
+from backend.app.services.db_service import service_db
+
+load_dotenv()
+
+
+class BloomFilter:
+    # Filtre de Bloom des jti révoqués : une réponse négative est certaine,
+    # une réponse positive peut être un faux positif.
+
+    def __init__(self: Self, capacity: int, error_rate: float = 0.001) -> None:
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self: Self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self: Self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self: Self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class Service_REVOCATION:
+    """
+    Cache de révocation des tokens, consulté à chaque requête authentifiée.
+
+    Désactivé par défaut : REVOCATION_CACHE_ENABLED=1 demande un Redis
+    joignable (REDIS_HOST). Sans lui, chaque vérification interroge MongoDB
+    et les révocations n'ont besoin que de MongoDB.
+
+    Chaque worker garde en mémoire les jti déjà vérifiés valides (TTL de
+    REVOCATION_CACHE_TTL_SECONDS, borné par l'expiration du token) et les jti
+    révoqués. Une révocation écrit d'abord MongoDB, puis pose un marqueur
+    Redis et publie le jti sur REVOCATION_CHANNEL : chaque worker abonné
+    l'évince de son cache dès réception. Le cache des jti valides n'est
+    utilisé que tant que l'abonnement est actif ; sans Redis, ou après une
+    coupure, la vérification repasse par Redis puis MongoDB.
+
+    Fenêtre d'incohérence bornée : l'abonné envoie régulièrement un PING
+    horodaté sur sa connexion ; Redis répondant dans l'ordre, le PONG
+    prouve que toutes les révocations publiées avant l'envoi ont été
+    reçues. Le cache (et le filtre de Bloom) ne répond que si ce PONG date
+    de moins de REVOCATION_MAX_STALENESS_SECONDS : un autre worker peut
+    donc accepter un token révoqué au plus pendant cette durée.
+
+    Avec REVOCATION_BLOOM_ENABLED, un filtre de Bloom des jti révoqués,
+    chargé depuis MongoDB à l'abonnement et tenu à jour par le canal,
+    répond directement pour les jti absents du cache.
+
+    Si la publication échoue malgré les nouvelles tentatives, la révocation
+    lève RevocationPropagationError ; le worker repasse au chemin lent et
+    se réabonne, en republiant les jti en attente avant de refaire
+    confiance à son cache.
+
+    Les appels Redis sont bornés par REVOCATION_REDIS_TIMEOUT ; après un
+    échec, Redis n'est plus consulté pendant REVOCATION_BREAKER_SECONDS et
+    les vérifications vont directement à MongoDB.
+    """
+
+    KEY_PREFIX: str = "revoked"
+    PUBLISH_ATTEMPTS: int = 3
+
+    def __init__(self: Self) -> None:
+        self.enabled = (
+            os.environ.get(ENUM_REVOCATION_ENV.CACHE_ENABLED.value, "0") == "1"
+        )
+        self.ttl = int(os.environ.get(ENUM_REVOCATION_ENV.TTL_SECONDS.value, 300))
+        self.max_entries = int(
+            os.environ.get(ENUM_REVOCATION_ENV.MAX_ENTRIES.value, 10000)
+        )
+        self.channel = os.environ.get(
+            ENUM_REVOCATION_ENV.CHANNEL.value, "token_revocations"
+        )
+        self.bloom_enabled = (
+            os.environ.get(ENUM_REVOCATION_ENV.BLOOM_ENABLED.value, "0") == "1"
+        )
+        self.bloom_capacity = int(
+            os.environ.get(ENUM_REVOCATION_ENV.BLOOM_CAPACITY.value, 100000)
+        )
+        self.redis_timeout = float(
+            os.environ.get(ENUM_REVOCATION_ENV.REDIS_TIMEOUT.value, 0.2)
+        )
+        self.breaker_seconds = float(
+            os.environ.get(ENUM_REVOCATION_ENV.BREAKER_SECONDS.value, 30)
+        )
+        self.max_staleness = float(
+            os.environ.get(ENUM_REVOCATION_ENV.MAX_STALENESS.value, 1.0)
+        )
+
+        self._valid: OrderedDict[str, float] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+        self._bloom: BloomFilter | None = None
+        self._lock = threading.Lock()
+        # Incrémentée à chaque révocation reçue : une vérification lancée
+        # avant ne doit pas remettre le jti dans le cache des valides.
+        self._generation = 0
+        self._subscribed = False
+        self._resync = False
+        self._pending: dict[str, float] = {}
+        self._pid: int | None = None
+        self._redis_client: Redis | None = None
+        self._breaker_until = 0.0
+        # Heure d'envoi (monotonic) du dernier PING acquitté par Redis.
+        self._last_contact = float("-inf")
+
+    @property
+    def _redis(self: Self) -> Redis:
+        # Client dédié aux délais courts : une vérification ne doit jamais
+        # attendre un Redis injoignable.
+        if self._redis_client is None:
+            self._redis_client = Redis(
+                host=os.environ.get(ENUM_REDIS_ENV.REDIS_HOST.value, "localhost"),
+                port=int(os.environ.get(ENUM_REDIS_ENV.REDIS_PORT.value, 6379)),
+                db=int(os.environ.get(ENUM_REDIS_ENV.REDIS_DB.value, 0)),
+                socket_timeout=self.redis_timeout,
+                socket_connect_timeout=self.redis_timeout,
+            )
+        return self._redis_client
+
+    def _breaker_open(self: Self) -> bool:
+        return time.monotonic() < self._breaker_until
+
+    def _trip(self: Self, error: Exception) -> None:
+        # Un seul avertissement par ouverture du disjoncteur.
+        was_open = self._breaker_open()
+        self._breaker_until = time.monotonic() + self.breaker_seconds
+        if not was_open:
+            logger.warning(
+                f"Token revocation: Redis unavailable, MongoDB only for "
+                f"{self.breaker_seconds:.0f}s: {str(error)}"
+            )
+
+    def key(self: Self, jti: str) -> str:
+        return f"{self.KEY_PREFIX}:{jti}"
+
+    def is_revoked(self: Self, jti: str, lookup) -> bool:
+        """
+        Indique si le jti est révoqué, en ne consultant Redis puis MongoDB
+        (via lookup) qu'en l'absence de réponse certaine en mémoire.
+
+        Args:
+            jti (str): L'identifiant du token.
+            lookup (Callable[[], tuple[bool, float | None]]): Lecture MongoDB,
+                renvoie l'état de révocation et l'expiration du token.
+        """
+        if not self.enabled:
+            return lookup()[0]
+
+        self._ensure_subscriber()
+        now = time.time()
+        with self._lock:
+            if jti in self._revoked:
+                return True
+            if (
+                self._subscribed
+                and time.monotonic() - self._last_contact <= self.max_staleness
+            ):
+                expires_at = self._valid.get(jti)
+                if expires_at is not None and expires_at > now:
+                    self._valid.move_to_end(jti)
+                    return False
+                if self._bloom is not None and jti not in self._bloom:
+                    return False
+            generation = self._generation
+
+        if self._redis_revoked(jti):
+            with self._lock:
+                self._revoked[jti] = now + self.ttl
+            return True
+
+        revoked, expires = lookup()
+        with self._lock:
+            if revoked:
+                self._revoked[jti] = now + self.ttl
+            elif generation == self._generation:
+                self._remember(jti, expires, now)
+        return revoked
+
+    def remember_valid(self: Self, jti: str, expires: float | None) -> None:
+        # Token tout juste émis : inutile de relire MongoDB à son premier usage.
+        if self.enabled:
+            with self._lock:
+                self._remember(jti, expires, time.time())
+
+    def _remember(self: Self, jti: str, expires: float | None, now: float) -> None:
+        expires_at = now + self.ttl
+        if expires is not None:
+            expires_at = min(expires_at, expires)
+        self._valid[jti] = expires_at
+        self._valid.move_to_end(jti)
+        while len(self._valid) > self.max_entries:
+            self._valid.popitem(last=False)
+
+    def publish(self: Self, tokens: dict[str, float]) -> None:
+        """
+        Propage des révocations déjà écrites dans MongoDB : éviction locale,
+        puis marqueurs Redis (jusqu'à l'expiration de chaque token) et
+        message sur le canal, avec quelques nouvelles tentatives.
+
+        Args:
+            tokens (dict[str, float]): Les jti révoqués et leur expiration
+                (timestamp).
+        """
+        if not tokens or not self.enabled:
+            return
+
+        self._ensure_subscriber()
+        self._evict(tokens)
+        for attempt in range(self.PUBLISH_ATTEMPTS):
+            try:
+                self._deliver(tokens)
+                return
+            except Exception as e:
+                error = e
+                self._trip(e)
+                if attempt + 1 < self.PUBLISH_ATTEMPTS:
+                    time.sleep(0.1 * 2**attempt)
+
+        # Les autres workers n'ont pas été prévenus : ce worker cesse de se
+        # fier à son cache et la boucle d'abonnement republiera ces jti.
+        logger.error(f"Token revocation: Redis publish failed: {str(error)}")
+        with self._lock:
+            self._pending.update(tokens)
+            self._subscribed = False
+            self._resync = True
+            self._bloom = None
+            self._valid.clear()
+        raise RevocationPropagationError(str(error))
+
+    def _deliver(self: Self, tokens: dict[str, float]) -> None:
+        now = time.time()
+        pipeline = self._redis.pipeline()
+        for jti, expires in tokens.items():
+            pipeline.set(self.key(jti), 1, ex=max(1, int(expires - now)))
+        pipeline.publish(self.channel, json.dumps(list(tokens)))
+        pipeline.execute()
+
+    def _evict(self: Self, jtis: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._generation += 1
+            for jti in jtis:
+                self._valid.pop(jti, None)
+                self._revoked[jti] = now + self.ttl
+                if self._bloom is not None:
+                    self._bloom.add(jti)
+            self._revoked = {
+                jti: expires
+                for jti, expires in self._revoked.items()
+                if expires > now
+            }
+
+    def _redis_revoked(self: Self, jti: str) -> bool:
+        if self._breaker_open():
+            return False
+        try:
+            return bool(self._redis.exists(self.key(jti)))
+        except Exception as e:
+            self._trip(e)
+            return False
+
+    def _ensure_subscriber(self: Self) -> None:
+        # Un abonnement par processus : le thread ne survit pas au fork des
+        # workers gunicorn.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._subscribed = False
+            self._valid.clear()
+        threading.Thread(target=self._subscribe_loop, daemon=True).start()
+
+    def _subscribe_loop(self: Self) -> None:
+        delay = 1.0
+        while True:
+            pubsub = None
+            try:
+                with self._lock:
+                    self._resync = False
+                    pending = dict(self._pending)
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if pending:
+                    self._deliver(pending)
+                    with self._lock:
+                        for jti in pending:
+                            self._pending.pop(jti, None)
+                bloom = self._load_bloom() if self.bloom_enabled else None
+
+                # Révocations publiées pendant le chargement du filtre.
+                while (message := pubsub.get_message(timeout=0.01)) is not None:
+                    self._handle_message(message, bloom)
+
+                # Les jti mis en cache avant l'abonnement ont pu être
+                # révoqués entre-temps sans message reçu.
+                with self._lock:
+                    self._bloom = bloom
+                    self._valid.clear()
+                    self._subscribed = True
+                logger.info(f"Token revocation: subscribed to {self.channel}")
+                delay = 1.0
+
+                last_ping = float("-inf")
+                while not self._resync:
+                    if time.monotonic() - last_ping >= self.max_staleness / 2:
+                        last_ping = time.monotonic()
+                        pubsub.ping(message=str(last_ping))
+                    message = pubsub.get_message(timeout=self.max_staleness / 4)
+                    if message is not None:
+                        self._handle_message(message)
+            except Exception as e:
+                logger.warning(f"Token revocation: subscription lost: {str(e)}")
+            finally:
+                # Des révocations ont pu être manquées : retour au chemin lent.
+                with self._lock:
+                    self._subscribed = False
+                    self._last_contact = float("-inf")
+                    self._bloom = None
+                    self._valid.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _handle_message(self: Self, message: dict, bloom=None) -> None:
+        if message.get("type") == "pong":
+            self._last_contact = float(message["data"])
+            return
+        if message.get("type") != "message":
+            return
+        jtis = json.loads(message["data"])
+        if bloom is not None:
+            for jti in jtis:
+                bloom.add(jti)
+        self._evict(jtis)
+
+    def _load_bloom(self: Self) -> BloomFilter:
+        bloom = BloomFilter(self.bloom_capacity)
+        # Les tokens expirés sont déjà refusés par flask_jwt_extended.
+        jtis = service_db.find_token_by_filters(
+            multiple=True, is_revoked=True
+        ).filter(expires__gt=datetime.datetime.now())
+        for jti in jtis.scalar("jti"):
+            bloom.add(jti)
+        return bloom
+
+
+service_revocation: Service_REVOCATION = Service_REVOCATION()
@@ -0,0 +1,180 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Self
+import numpy as np
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_SCHEDULER_ENV
+from backend.app.log import logger
+
+load_dotenv()
+
+BATCH_SIZE_BUCKETS: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def is_scheduler_enabled() -> bool:
+    return os.environ.get(ENUM_SCHEDULER_ENV.ENABLED.value, "0") == "1"
+
+
+def slice_outputs(outputs, start: int, end: int):
+    # Les modèles multi-sorties (Keras) renvoient une liste de tableaux.
+    if isinstance(outputs, (list, tuple)):
+        return [output[start:end] for output in outputs]
+    return outputs[start:end]
+
+
+class Service_SCHEDULER:
+    """
+    Regroupe les lots de visages envoyés par des requêtes concurrentes pour
+    un même modèle et les exécute en un seul passage avant.
+
+    Chaque requête soumet son propre lot (N visages) et récupère uniquement
+    les sorties correspondant à ses visages. Un lot est déclenché dès que
+    la fenêtre d'attente expire ou que la taille maximale est atteinte.
+    """
+
+    def __init__(
+        self: Self,
+        name: str,
+        forward: Callable[[np.ndarray], object],
+        window_ms: float | None = None,
+        max_batch: int | None = None,
+    ) -> None:
+        self._name = name
+        self._forward = forward
+        self._window = (
+            window_ms
+            if window_ms is not None
+            else float(os.environ.get(ENUM_SCHEDULER_ENV.WINDOW_MS.value, 10))
+        ) / 1000
+        self._max_batch = (
+            max_batch
+            if max_batch is not None
+            else int(os.environ.get(ENUM_SCHEDULER_ENV.MAX_BATCH.value, 64))
+        )
+
+        self._queue: queue.Queue = queue.Queue()
+        self._carry: tuple | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._faces = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._batch_sizes: dict[str, int] = {
+            f"le_{bucket}": 0 for bucket in BATCH_SIZE_BUCKETS
+        } | {"le_inf": 0}
+
+    def submit(self: Self, batch: np.ndarray):
+        self._ensure_started()
+
+        future: Future = Future()
+        self._queue.put((batch, future, time.perf_counter()))
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+
+        return future.result()
+
+    def _ensure_started(self: Self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name=f"scheduler-{self._name}", daemon=True
+                )
+                self._thread.start()
+
+    def _next_item(self: Self, timeout: float | None):
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        return self._queue.get(timeout=timeout)
+
+    def _collect(self: Self) -> list[tuple]:
+        items = [self._next_item(None)]
+        size = len(items[0][0])
+        deadline = time.perf_counter() + self._window
+
+        while size < self._max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._next_item(remaining)
+            except queue.Empty:
+                break
+
+            if size + len(item[0]) > self._max_batch:
+                self._carry = item
+                break
+
+            items.append(item)
+            size += len(item[0])
+
+        return items
+
+    def _loop(self: Self) -> None:
+        while True:
+            items = self._collect()
+            started = time.perf_counter()
+
+            try:
+                merged = (
+                    items[0][0]
+                    if len(items) == 1
+                    else np.concatenate([batch for batch, _, _ in items])
+                )
+                outputs = self._forward(merged)
+            except Exception as e:
+                logger.error(f"Scheduler '{self._name}' forward failed: {str(e)}")
+                for _, future, _ in items:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for batch, future, _ in items:
+                future.set_result(slice_outputs(outputs, offset, offset + len(batch)))
+                offset += len(batch)
+
+            self._record(items, offset, started)
+
+    def _record(self: Self, items: list[tuple], size: int, started: float) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(items)
+            self._faces += size
+            self._total_wait += sum(started - queued for _, _, queued in items)
+
+            bucket = next(
+                (f"le_{b}" for b in BATCH_SIZE_BUCKETS if size <= b), "le_inf"
+            )
+            self._batch_sizes[bucket] += 1
+
+    def stats(self: Self) -> dict:
+        with self._stats_lock:
+            return {
+                "window_ms": self._window * 1000,
+                "max_batch": self._max_batch,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "batches": self._batches,
+                "requests": self._requests,
+                "faces": self._faces,
+                "avg_batch_size": (
+                    round(self._faces / self._batches, 2) if self._batches else 0
+                ),
+                "avg_queue_wait_ms": (
+                    round(self._total_wait / self._requests * 1000, 3)
+                    if self._requests
+                    else 0
+                ),
+                "batch_sizes": dict(self._batch_sizes),
+            }
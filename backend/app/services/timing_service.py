@@ -0,0 +1,114 @@
+import os
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from typing import Self
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_TIMING_ENV
+from backend.app.services.metrics_service import service_metrics
+
+load_dotenv()
+
+_NULL_STAGE = nullcontext()
+
+
+class RequestTimer:
+    # Durées cumulées par étape pour la requête en cours.
+
+    def __init__(self: Self) -> None:
+        self.start = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def add(self: Self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def as_dict(self: Self) -> dict[str, float]:
+        return {name: round(seconds * 1000, 2) for name, seconds in self.stages.items()}
+
+    def header(self: Self) -> str:
+        total = (time.perf_counter() - self.start) * 1000
+        entries = [
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()
+        ]
+        return ", ".join(entries + [f"total;dur={total:.2f}"])
+
+
+class Stage:
+    # Chronomètre d'une étape : alimente le timer de la requête et les
+    # métriques Prometheus.
+
+    __slots__ = ("name", "typeModel", "timer", "begin")
+
+    def __init__(self: Self, name: str, typeModel: str | None, timer) -> None:
+        self.name = name
+        self.typeModel = typeModel
+        self.timer = timer
+
+    def __enter__(self: Self) -> Self:
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self: Self, *exc) -> None:
+        seconds = time.perf_counter() - self.begin
+        if self.timer is not None:
+            self.timer.add(self.name, seconds)
+        if self.typeModel is not None:
+            service_metrics.observe_stage(self.typeModel, self.name, seconds)
+
+
+class Service_TIMING:
+    """
+    Chronométrage par étape des prédictions (decode, detect, preprocess,
+    forward, format, ...), renvoyé au client dans l'en-tête Server-Timing.
+
+    Le timer vit dans une ContextVar posée par le middleware de requête ;
+    hors requête (ou SERVER_TIMING_ENABLED=0) et sans métriques, stage()
+    renvoie un nullcontext partagé : le coût se limite à une lecture de
+    ContextVar. SERVER_TIMING_DEBUG=1 permet en plus au client d'obtenir
+    le détail dans le corps JSON avec l'en-tête X-Debug-Timing: 1.
+    """
+
+    DEBUG_HEADER: str = "X-Debug-Timing"
+
+    def __init__(self: Self) -> None:
+        self.enabled = os.environ.get(ENUM_TIMING_ENV.ENABLED.value, "0") == "1"
+        self.debug = os.environ.get(ENUM_TIMING_ENV.DEBUG.value, "0") == "1"
+        self._current: ContextVar[RequestTimer | None] = ContextVar(
+            "request_timer", default=None
+        )
+
+    def start(self: Self, force: bool = False) -> Token | None:
+        # force : timer demandé par le client du serveur de modèles, quelle
+        # que soit la configuration du processus d'inférence.
+        if not (self.enabled or force):
+            return None
+        return self._current.set(RequestTimer())
+
+    def stop(self: Self, token: Token | None) -> None:
+        if token is not None:
+            self._current.reset(token)
+
+    def current(self: Self) -> RequestTimer | None:
+        return self._current.get()
+
+    def merge(self: Self, stages: dict[str, float], elapsed: float) -> None:
+        # Étapes mesurées dans un processus d'inférence ; le reste de
+        # l'aller-retour (mémoire partagée, socket) est compté à part.
+        timer = self._current.get()
+        if timer is None:
+            return
+        for name, seconds in stages.items():
+            timer.add(name, seconds)
+        timer.add("model_server", max(0.0, elapsed - sum(stages.values())))
+
+    def stage(self: Self, name: str, typeModel: str | None = None, report=True):
+        # report=False : étape englobant d'autres étapes, seulement mesurée
+        # dans Prometheus pour ne pas compter deux fois le même temps dans
+        # Server-Timing.
+        timer = self._current.get() if report else None
+        if timer is None and (typeModel is None or not service_metrics.enabled):
+            return _NULL_STAGE
+        return Stage(name, typeModel, timer)
+
+
+service_timing: Service_TIMING = Service_TIMING()
@@ -0,0 +1,259 @@
+import os
+from collections import Counter, deque
+from typing import Callable, Self
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+from backend.app.core.const.enum import ENUM_TRACKER_ENV
+from backend.app.services.detector_service import Box, box_iou, clip_box
+from backend.app.services.preprocess_service import face_regions
+
+load_dotenv()
+
+# Taille de la vignette utilisée pour savoir si le visage a changé.
+SIGNATURE_SIZE: tuple[int, int] = (16, 16)
+
+
+class Track:
+    # Visage suivi d'image en image, avec ses attributs lissés.
+
+    def __init__(self: Self, track_id: int, box: Box, votes: int) -> None:
+        self.id = track_id
+        self.box = box
+        self.confidence = 1.0
+        self.misses = 0
+        self.age: float | None = None
+        self.genders: deque[str] = deque(maxlen=votes)
+        self.ethnicities: deque[str] = deque(maxlen=votes)
+        self.signature: np.ndarray | None = None
+        self.frames_since_classified = 0
+
+    def update_attributes(self: Self, face: dict, smoothing: float) -> None:
+        if "age" in face:
+            self.age = (
+                face["age"]
+                if self.age is None
+                else smoothing * face["age"] + (1 - smoothing) * self.age
+            )
+        if "gender" in face:
+            self.genders.append(face["gender"])
+        if "ethnicity" in face:
+            self.ethnicities.append(face["ethnicity"])
+        self.frames_since_classified = 0
+
+    def attributes(self: Self, categorize_age: Callable[[int], str]) -> dict:
+        attributes = {}
+        if self.genders:
+            attributes["gender"] = Counter(self.genders).most_common(1)[0][0]
+        if self.age is not None:
+            attributes["age"] = round(self.age)
+            attributes["age_range"] = categorize_age(round(self.age))
+        if self.ethnicities:
+            attributes["ethnicity"] = Counter(self.ethnicities).most_common(1)[0][0]
+        return attributes
+
+
+class FaceTracker:
+    """
+    Suivi des visages d'un flux vidéo (une instance par flux).
+
+    La détection complète ne tourne que toutes les TRACKER_DETECT_EVERY
+    images, ou dès qu'une piste perd confiance ; entre deux détections les
+    boîtes sont déplacées par flux optique (Lucas-Kanade) et les nouvelles
+    détections sont associées aux pistes par IoU. Un visage n'est reclassé
+    que s'il est nouveau, si sa vignette a sensiblement changé ou après
+    TRACKER_RECLASSIFY_EVERY images ; ses attributs sont lissés par piste
+    (moyenne exponentielle pour l'âge, vote majoritaire sinon).
+    """
+
+    def __init__(self: Self, config: dict) -> None:
+        self.config = config
+        self.tracks: list[Track] = []
+        self._next_id = 1
+        self._frame_index = 0
+        self._previous_gray: np.ndarray | None = None
+        self.detections = 0
+        self.classifications = 0
+
+    def update(self: Self, image: np.ndarray, model) -> list[dict]:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        height, width = gray.shape
+
+        # Changement de résolution du flux : les pistes ne sont plus valides.
+        if self._previous_gray is not None and self._previous_gray.shape != gray.shape:
+            self.tracks = []
+            self._previous_gray = None
+
+        if self._previous_gray is not None and self.tracks:
+            for track in self.tracks:
+                self._follow(track, self._previous_gray, gray, width, height)
+
+        if self._needs_detection():
+            boxes = model.detect_faces(image)
+            self._associate([clip_box(box, width, height) for box in boxes])
+            self.detections += 1
+
+        self._previous_gray = gray
+        self._frame_index += 1
+
+        self._classify(image, gray, model)
+        return [
+            {
+                "id": track.id,
+                "box": dict(zip(("top", "right", "bottom", "left"), track.box)),
+                "confidence": round(track.confidence, 2),
+            }
+            | track.attributes(model.categorize_age)
+            for track in self.tracks
+        ]
+
+    def _needs_detection(self: Self) -> bool:
+        return (
+            not self.tracks
+            or self._frame_index % self.config["detect_every"] == 0
+            or any(
+                track.confidence < self.config["min_confidence"]
+                for track in self.tracks
+            )
+        )
+
+    def _follow(
+        self: Self,
+        track: Track,
+        previous: np.ndarray,
+        gray: np.ndarray,
+        width: int,
+        height: int,
+    ) -> None:
+        # Déplace la boîte du déplacement médian des points suivis ; la
+        # confiance est la part des points retrouvés.
+        top, right, bottom, left = track.box
+        if bottom - top < 2 or right - left < 2:
+            track.confidence = 0.0
+            return
+
+        points = cv2.goodFeaturesToTrack(
+            previous[top:bottom, left:right],
+            maxCorners=30,
+            qualityLevel=0.01,
+            minDistance=4,
+        )
+        if points is None:
+            track.confidence = 0.0
+            return
+
+        points = (points + np.float32([left, top])).astype(np.float32)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(
+            previous, gray, points, None, winSize=(15, 15), maxLevel=2
+        )
+        found = status.reshape(-1) == 1
+        track.confidence = float(found.mean())
+        if not found.any():
+            return
+
+        dx, dy = np.median((moved - points).reshape(-1, 2)[found], axis=0)
+        track.box = clip_box(
+            (top + dy, right + dx, bottom + dy, left + dx), width, height
+        )
+
+    def _associate(self: Self, boxes: list[Box]) -> None:
+        # Association gloutonne détection/piste par IoU décroissant.
+        pairs = sorted(
+            (
+                (box_iou(track.box, box), track_index, box_index)
+                for track_index, track in enumerate(self.tracks)
+                for box_index, box in enumerate(boxes)
+            ),
+            reverse=True,
+        )
+        matched_tracks, matched_boxes = set(), set()
+        for iou, track_index, box_index in pairs:
+            if iou < self.config["iou_threshold"]:
+                break
+            if track_index in matched_tracks or box_index in matched_boxes:
+                continue
+            track = self.tracks[track_index]
+            track.box = boxes[box_index]
+            track.confidence = 1.0
+            track.misses = 0
+            matched_tracks.add(track_index)
+            matched_boxes.add(box_index)
+
+        for track_index, track in enumerate(self.tracks):
+            if track_index not in matched_tracks:
+                track.misses += 1
+        self.tracks = [
+            track
+            for track in self.tracks
+            if track.misses <= self.config["max_misses"]
+        ]
+
+        for box_index, box in enumerate(boxes):
+            if box_index not in matched_boxes:
+                self.tracks.append(Track(self._next_id, box, self.config["votes"]))
+                self._next_id += 1
+
+    def _classify(self: Self, image: np.ndarray, gray: np.ndarray, model) -> None:
+        to_classify = []
+        for track in self.tracks:
+            track.frames_since_classified += 1
+            top, right, bottom, left = track.box
+            crop = gray[top:bottom, left:right]
+            if crop.size == 0:
+                continue
+
+            signature = cv2.resize(crop, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+            signature = signature.astype(np.float32) / 255
+            if (
+                track.signature is None
+                or np.abs(signature - track.signature).mean()
+                > self.config["crop_change"]
+                or track.frames_since_classified > self.config["reclassify_every"]
+            ):
+                track.signature = signature
+                to_classify.append(track)
+
+        if not to_classify:
+            return
+
+        # Un seul lot pour tous les visages à (re)classer.
+        regions = face_regions(image.shape, [track.box for track in to_classify])
+        for track, face in zip(to_classify, model.predict_faces(image, regions)):
+            track.update_attributes(face, self.config["smoothing"])
+        self.classifications += len(to_classify)
+
+
+class Service_TRACKER:
+    """
+    Paramètres du suivi de visages, lus une fois, et création d'un
+    FaceTracker par flux vidéo.
+    """
+
+    def __init__(self: Self) -> None:
+        self.enabled = os.environ.get(ENUM_TRACKER_ENV.ENABLED.value, "1") == "1"
+        self.config = {
+            "detect_every": int(
+                os.environ.get(ENUM_TRACKER_ENV.DETECT_EVERY.value, 5)
+            ),
+            "min_confidence": float(
+                os.environ.get(ENUM_TRACKER_ENV.MIN_CONFIDENCE.value, 0.6)
+            ),
+            "iou_threshold": float(
+                os.environ.get(ENUM_TRACKER_ENV.IOU_THRESHOLD.value, 0.3)
+            ),
+            "max_misses": int(os.environ.get(ENUM_TRACKER_ENV.MAX_MISSES.value, 2)),
+            "crop_change": float(
+                os.environ.get(ENUM_TRACKER_ENV.CROP_CHANGE.value, 0.12)
+            ),
+            "reclassify_every": int(
+                os.environ.get(ENUM_TRACKER_ENV.RECLASSIFY_EVERY.value, 30)
+            ),
+            "smoothing": float(os.environ.get(ENUM_TRACKER_ENV.SMOOTHING.value, 0.3)),
+            "votes": int(os.environ.get(ENUM_TRACKER_ENV.VOTES.value, 7)),
+        }
+
+    def create(self: Self) -> FaceTracker:
+        return FaceTracker(self.config)
+
+
+service_tracker: Service_TRACKER = Service_TRACKER()
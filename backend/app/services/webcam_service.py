@@ -0,0 +1,233 @@
+import base64
+import os
+import threading
+import time
+from typing import Self
+from dotenv import load_dotenv
+from backend.app.core.const.enum import (
+    ENUM_MODELS_TYPE,
+    ENUM_SOCKET_EVENT,
+    ENUM_SOCKET_NAMESPACE,
+    ENUM_WEBCAM_ENV,
+)
+from backend.app.exeptions import ImageTooLargeError, InvalidImageError
+from backend.app.extension.extensions import ext
+from backend.app.log import logger
+from backend.app.services.image_service import service_image
+from backend.app.services.model_server_service import service_model_server
+from backend.app.services.models_service import Service_MODEL
+from backend.app.services.registry_service import service_registry
+from backend.app.services.tracker_service import FaceTracker, service_tracker
+
+load_dotenv()
+
+
+class RemoteModel:
+    # Modèle servi par le serveur de modèles, avec l'interface de
+    # Service_MODEL utilisée par le suivi de visages.
+
+    categorize_age = staticmethod(Service_MODEL.categorize_age)
+
+    def __init__(self: Self, typeModel: str) -> None:
+        self.typeModel = typeModel
+
+    def detect_faces(self: Self, image):
+        return service_model_server.detect(image)
+
+    def predict_faces(self: Self, image, regions: list) -> list[dict]:
+        return service_model_server.predict_faces(image, self.typeModel, regions)
+
+
+class WebcamSession:
+    # État d'un client : seule la dernière image reçue est conservée.
+
+    def __init__(self: Self, sid: str) -> None:
+        self.sid = sid
+        self.lock = threading.Lock()
+        self.pending = threading.Event()
+        self.active = True
+        self.frame: bytes | None = None
+        self.frame_id = None
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.tracker: FaceTracker | None = (
+            service_tracker.create() if service_tracker.enabled else None
+        )
+
+
+class Service_WEBCAM:
+    """
+    Inférence temps réel sur le flux webcam d'un client Socket.IO (wrtv).
+
+    Chaque client a une boucle de traitement dédiée et un emplacement d'une
+    seule image : une image arrivée avant que la précédente soit traitée la
+    remplace (elle est comptée comme abandonnée) au lieu d'être mise en file.
+    La boucle ne traite pas plus de WEBCAM_MAX_FPS images par seconde et par
+    client, et renvoie pour chaque image traitée les visages détectés et
+    leurs attributs, prédits par le modèle WEBCAM_MODEL_TYPE. Avec le suivi
+    (TRACKER_ENABLED), chaque visage garde un identifiant d'image en image.
+
+    Avec MODEL_SERVER_ENABLED, détection et prédictions passent par le
+    serveur de modèles : le worker web ne charge aucun modèle. Les sessions
+    vivent dans le worker qui a reçu la connexion : avec plusieurs workers
+    gunicorn, il faut SOCKETIO_MESSAGE_QUEUE et des sessions collantes côté
+    proxy (ou des clients en transport websocket seul) ; sinon, un seul
+    worker.
+    """
+
+    def __init__(self: Self) -> None:
+        self.typeModel = os.environ.get(
+            ENUM_WEBCAM_ENV.MODEL_TYPE.value,
+            ENUM_MODELS_TYPE.GENDER_AND_AGE_SCRATCH.value,
+        )
+        self.max_fps = float(os.environ.get(ENUM_WEBCAM_ENV.MAX_FPS.value, 10))
+        self.namespace = ENUM_SOCKET_NAMESPACE.WEBCAM.value
+
+        self._sessions: dict[str, WebcamSession] = {}
+        self._lock = threading.Lock()
+
+    def open(self: Self, sid: str) -> None:
+        session = WebcamSession(sid)
+        with self._lock:
+            self._sessions[sid] = session
+        ext.socketio_ext.start_background_task(self._run, session)
+        logger.info(f"Webcam session {sid} opened")
+
+    def close(self: Self, sid: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(sid, None)
+        if session is None:
+            return
+        session.active = False
+        session.pending.set()
+        logger.info(
+            f"Webcam session {sid} closed: {session.received} frames received, "
+            f"{session.processed} processed, {session.dropped} dropped"
+        )
+
+    def push(self: Self, sid: str, data: bytes | str | dict) -> None:
+        session = self._sessions.get(sid)
+        if session is None:
+            return
+
+        frame_id = None
+        if isinstance(data, dict):
+            frame_id = data.get("id")
+            data = data.get("image")
+
+        with session.lock:
+            session.received += 1
+            if session.frame is not None:
+                session.dropped += 1
+            session.frame = self.read_frame(data)
+            session.frame_id = frame_id
+        session.pending.set()
+
+    def read_frame(self: Self, data: bytes | str | None) -> bytes:
+        # Octets bruts (JPEG/PNG) ou data URL base64 (canvas.toDataURL).
+        # Une image vide ou mal encodée est rejetée au décodage.
+        if isinstance(data, str):
+            try:
+                data = base64.b64decode(data.split(",", 1)[-1])
+            except ValueError:
+                return b""
+        return data or b""
+
+    def _run(self: Self, session: WebcamSession) -> None:
+        interval = 1 / self.max_fps if self.max_fps > 0 else 0.0
+        next_run = 0.0
+        while session.active:
+            if not session.pending.wait(timeout=1.0):
+                continue
+
+            # Plafond d'images par seconde : les images reçues pendant
+            # l'attente remplacent celle en attente.
+            delay = next_run - time.monotonic()
+            if delay > 0:
+                ext.socketio_ext.sleep(delay)
+
+            with session.lock:
+                data, frame_id = session.frame, session.frame_id
+                session.frame = None
+                session.pending.clear()
+            if data is None or not session.active:
+                continue
+
+            next_run = time.monotonic() + interval
+            start = time.perf_counter()
+            try:
+                faces = self.predict(session, data)
+            except (ImageTooLargeError, InvalidImageError) as e:
+                self._emit(
+                    session,
+                    ENUM_SOCKET_EVENT.ERROR.value,
+                    {"id": frame_id, "message": "Image illisible", "details": str(e)},
+                )
+                continue
+            except Exception as e:
+                logger.error(f"Webcam inference failed: {str(e)}", exc_info=True)
+                self._emit(
+                    session,
+                    ENUM_SOCKET_EVENT.ERROR.value,
+                    {"id": frame_id, "message": "Erreur lors de la prédiction"},
+                )
+                continue
+
+            session.processed += 1
+            self._emit(
+                session,
+                ENUM_SOCKET_EVENT.RESULT.value,
+                {
+                    "id": frame_id,
+                    "model": self.typeModel,
+                    "faces": faces,
+                    "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "dropped": session.dropped,
+                },
+            )
+
+    def predict(self: Self, session: WebcamSession, data: bytes) -> list[dict]:
+        image = service_image.decode(data)
+        if service_model_server.enabled:
+            if session.tracker is not None:
+                return session.tracker.update(image, RemoteModel(self.typeModel))
+            return service_model_server.predict_faces(image, self.typeModel)
+
+        model = service_registry.get(self.typeModel)
+        if session.tracker is not None:
+            return session.tracker.update(image, model)
+
+        regions = model.extract_faces(image)
+        if isinstance(regions, str):
+            return []
+        return model.predict_faces(image, regions)
+
+    def _emit(self: Self, session: WebcamSession, event: str, payload: dict) -> None:
+        if session.active:
+            ext.socketio_ext.emit(
+                event, payload, to=session.sid, namespace=self.namespace
+            )
+
+    def stats(self: Self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "model": self.typeModel,
+            "max_fps": self.max_fps,
+            "sessions": len(sessions),
+            "received": sum(session.received for session in sessions),
+            "processed": sum(session.processed for session in sessions),
+            "dropped": sum(session.dropped for session in sessions),
+            "detections": sum(
+                session.tracker.detections for session in sessions if session.tracker
+            ),
+            "classifications": sum(
+                session.tracker.classifications
+                for session in sessions
+                if session.tracker
+            ),
+        }
+
+
+service_webcam: Service_WEBCAM = Service_WEBCAM()
@@ -0,0 +1,98 @@
+"""
+Compare la latence et le rappel des détecteurs de visages sur un jeu d'images fixe.
+
+Usage :
+    python -m backend.tools.bench_detectors --images data/faces \\
+        --annotations data/faces/annotations.json --backends hog,haar,dnn,mtcnn
+
+Le fichier d'annotations associe chaque nom d'image à sa liste de boîtes
+[top, right, bottom, left]. Une détection est correcte si son IoU avec une
+boîte annotée dépasse --iou.
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from PIL import Image, ImageOps
+from backend.app.core.const.enum import ENUM_DETECTOR_TYPE
+from backend.app.services.detector_service import box_iou, service_detector
+
+
+def load_images(folder: str) -> dict[str, np.ndarray]:
+    images = {}
+    for filename in sorted(os.listdir(folder)):
+        if filename.rsplit(".", 1)[-1].lower() not in ("jpg", "jpeg", "png"):
+            continue
+        with Image.open(os.path.join(folder, filename)) as image:
+            images[filename] = np.asarray(ImageOps.exif_transpose(image).convert("RGB"))
+    return images
+
+
+def count_matches(truth: list, detections: list, iou: float) -> tuple[int, int]:
+    matched, used = 0, set()
+    for expected in truth:
+        for index, detection in enumerate(detections):
+            if index not in used and box_iou(tuple(expected), detection) >= iou:
+                matched += 1
+                used.add(index)
+                break
+    return matched, len(used)
+
+
+def bench(backend, images, annotations, repeat, iou) -> dict:
+    detector = service_detector.get(backend)
+    detector.detect(next(iter(images.values())))
+
+    latencies, expected, found, detected, true_detected = [], 0, 0, 0, 0
+    for filename, image in images.items():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            boxes = detector.detect(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        truth = annotations.get(filename, [])
+        matched, used = count_matches(truth, boxes, iou)
+        expected += len(truth)
+        found += matched
+        detected += len(boxes)
+        true_detected += used
+
+    return {
+        "backend": backend,
+        "mean_ms": float(np.mean(latencies)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "recall": found / expected if expected else float("nan"),
+        "precision": true_detected / detected if detected else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--images", required=True)
+    parser.add_argument("--annotations", required=True)
+    parser.add_argument(
+        "--backends", default=",".join(t.value for t in ENUM_DETECTOR_TYPE)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--iou", type=float, default=0.5)
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    with open(args.annotations) as annotations_file:
+        annotations = json.load(annotations_file)
+
+    print(f"{len(images)} images, {sum(map(len, annotations.values()))} visages annotés")
+    print(f"{'backend':<8} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'rappel':>8} {'précision':>10}")
+    for backend in args.backends.split(","):
+        result = bench(backend.strip(), images, annotations, args.repeat, args.iou)
+        print(
+            f"{result['backend']:<8} {result['mean_ms']:>9.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p95_ms']:>9.1f} {result['recall']:>8.3f} {result['precision']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Mesure le temps d'import de backend.app et la RSS de base du processus, et
+vérifie qu'aucun framework ML n'est importé au démarrage.
+
+Usage :
+    python -m backend.tools.bench_imports --max-seconds 3 --max-rss-mb 250
+
+Chaque mesure est faite dans un interpréteur neuf, sans préchargement des
+modèles, en mode normal puis API_ONLY=1. Le script échoue (code 1) si un
+seuil est dépassé ou si tensorflow, torch, ultralytics, ... sont chargés.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES: tuple[str, ...] = (
+    "tensorflow",
+    "torch",
+    "torchvision",
+    "ultralytics",
+    "timm",
+    "facenet_pytorch",
+    "face_recognition",
+    "onnxruntime",
+)
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import backend.app
+seconds = time.perf_counter() - start
+from backend.app.core.utility.utils import get_process_rss
+print(json.dumps({{
+    "seconds": seconds,
+    "rss": get_process_rss(),
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def probe(api_only: bool) -> dict:
+    env = os.environ | {
+        "API_ONLY": "1" if api_only else "0",
+        "MODELS_PRELOAD": "",
+        "MODELS_WARMUP": "0",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float)
+    parser.add_argument("--max-rss-mb", type=float)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'mode':<10} {'import s':>9} {'RSS Mo':>8}  modules lourds")
+    for api_only in (False, True):
+        mode = "API_ONLY" if api_only else "complet"
+        runs = [probe(api_only) for _ in range(args.repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss_mb = statistics.median(run["rss"] for run in runs) / 1024**2
+        heavy = sorted({module for run in runs for module in run["heavy"]})
+        print(f"{mode:<10} {seconds:>9.2f} {rss_mb:>8.1f}  {', '.join(heavy) or '-'}")
+
+        if heavy:
+            failures.append(f"{mode} : {', '.join(heavy)} importés au démarrage")
+        if args.max_seconds and seconds > args.max_seconds:
+            failures.append(f"{mode} : import en {seconds:.2f}s > {args.max_seconds}s")
+        if args.max_rss_mb and rss_mb > args.max_rss_mb:
+            failures.append(f"{mode} : RSS {rss_mb:.1f} Mo > {args.max_rss_mb} Mo")
+
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Mesure le coût par appel des modèles Keras : model.predict, tf.function
+tracée (chemin par défaut de Service_MODEL) et tf.function compilée XLA.
+
+Usage :
+    python -m backend.tools.bench_keras_call --types gs,as --batch-sizes 1,4,16
+
+Les modèles sont chargés avec le backend natif ; les entrées sont des lots
+aléatoires de la forme attendue par chaque passage avant.
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+
+os.environ["MODELS_BACKEND"] = "native"
+os.environ["ONNX_INT8_ENABLED"] = "0"
+
+from backend.app.services.models_service import Service_MODEL  # noqa: E402
+from backend.app.services.preprocess_service import input_shape  # noqa: E402
+
+
+def timeit(function, batch: np.ndarray, repeat: int) -> float:
+    function(batch)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(batch)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--types", default="gs,as,gas,gat")
+    parser.add_argument("--batch-sizes", default="1,4,16")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'passage':<14} {'lot':>4} {'predict ms':>11} {'tf.function ms':>15} "
+        f"{'XLA ms':>8} {'gain':>6}"
+    )
+    for typeModel in args.types.split(","):
+        model = Service_MODEL(typeModel.strip())
+        for name, native in model.native_models().items():
+            if not hasattr(native, "predict"):
+                continue
+
+            spec_name = model.FORWARD_SPECS[model._typeModel][name]
+            compiled = model.compile_keras(native, spec_name)
+            xla = model.compile_keras(native, spec_name, jit_compile=True)
+
+            for batch_size in batch_sizes:
+                shape = input_shape(spec_name, batch_size)
+                batch = rng.random(shape, dtype=np.float32)
+                predict_ms = timeit(
+                    lambda b: native.predict(b, batch_size=len(b), verbose=0),
+                    batch,
+                    args.repeat,
+                )
+                compiled_ms = timeit(lambda b: compiled(b), batch, args.repeat)
+                xla_ms = timeit(lambda b: xla(b), batch, args.repeat)
+                print(
+                    f"{model._typeModel + '.' + name:<14} {batch_size:>4} "
+                    f"{predict_ms:>11.2f} {compiled_ms:>15.2f} {xla_ms:>8.2f} "
+                    f"{predict_ms / compiled_ms:>5.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
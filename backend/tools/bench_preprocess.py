@@ -0,0 +1,99 @@
+"""
+Compare le prétraitement vectorisé (preprocess_service) à l'ancien chemin PIL.
+
+Usage :
+    python -m backend.tools.bench_preprocess --image photo.jpg --faces 32
+
+Sans --image, une image aléatoire 4000x3000 est utilisée. Les visages sont
+des boîtes tirées au hasard dans l'image.
+"""
+
+import argparse
+import time
+import numpy as np
+from PIL import Image
+from backend.app.services.preprocess_service import (
+    PREPROCESS_SPECS,
+    build_batch,
+    face_regions,
+)
+
+
+def legacy_crop(image: Image.Image, regions: list) -> list[Image.Image]:
+    return [
+        image.crop((left, top, right, bottom)).resize(
+            (200, 200), Image.Resampling.LANCZOS
+        )
+        for top, bottom, left, right in regions
+    ]
+
+
+def legacy_preprocess(face: Image.Image, spec: dict) -> np.ndarray:
+    face = face.convert("L" if spec["gray"] else "RGB").resize(spec["size"])
+    array = np.array(face) * spec["scale"]
+    if "mean" in spec:
+        array = (array - np.array(spec["mean"])) / np.array(spec["std"])
+    if spec["gray"]:
+        array = np.expand_dims(array, axis=-1)
+    if spec.get("channels_first"):
+        array = array.transpose(2, 0, 1)
+    return array
+
+
+def legacy_batch(image: Image.Image, regions: list, spec: dict) -> np.ndarray:
+    return np.stack([legacy_preprocess(face, spec) for face in legacy_crop(image, regions)])
+
+
+def random_locations(rng, width: int, height: int, count: int) -> list:
+    locations = []
+    for _ in range(count):
+        side = int(rng.integers(60, min(width, height) // 4))
+        left = int(rng.integers(0, width - side))
+        top = int(rng.integers(0, height - side))
+        locations.append((top, left + side, top + side, left))
+    return locations
+
+
+def timeit(function, repeat: int) -> float:
+    function()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--image")
+    parser.add_argument("--faces", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.image:
+        array = np.asarray(Image.open(args.image).convert("RGB"))
+    else:
+        array = rng.integers(0, 256, (3000, 4000, 3), dtype=np.uint8)
+    pil_image = Image.fromarray(array)
+
+    height, width = array.shape[:2]
+    regions = face_regions(
+        array.shape, random_locations(rng, width, height, args.faces)
+    )
+
+    print(f"Image {width}x{height}, {len(regions)} visages, {args.repeat} répétitions")
+    print(f"{'modèle':<22} {'PIL ms':>9} {'vectorisé ms':>13} {'gain':>6} {'écart max':>10}")
+    for name, spec in PREPROCESS_SPECS.items():
+        legacy_ms = timeit(lambda: legacy_batch(pil_image, regions, spec), args.repeat)
+        new_ms = timeit(lambda: build_batch(array, regions, name), args.repeat)
+        drift = np.abs(
+            legacy_batch(pil_image, regions, spec) - build_batch(array, regions, name)
+        ).max()
+        print(
+            f"{name:<22} {legacy_ms:>9.2f} {new_ms:>13.2f} "
+            f"{legacy_ms / new_ms:>5.1f}x {drift:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
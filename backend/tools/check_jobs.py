@@ -0,0 +1,129 @@
+"""
+Vérifie l'aller-retour d'un job asynchrone : dépôt, traitement par un
+worker (worker.py), lecture du résultat.
+
+Usage :
+    python -m backend.tools.check_jobs --image photo.jpg --type gas
+    python -m backend.tools.check_jobs --image photo.jpg --type gas --crash
+
+Sans --redis-port, un redis-server local est lancé sur un port libre pour
+la durée du test. Avec --crash, le premier worker est tué (SIGKILL)
+pendant le traitement : un second worker doit remettre le job en file et
+le terminer. Le script échoue (code 1) si le job n'aboutit pas.
+"""
+
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_redis(port: int, directory: str) -> subprocess.Popen:
+    if shutil.which("redis-server") is None:
+        sys.exit("redis-server introuvable : installez-le ou passez --redis-port")
+
+    process = subprocess.Popen(
+        ["redis-server", "--port", str(port), "--save", "", "--dir", directory],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    sys.exit("redis-server n'a pas démarré")
+
+
+def start_worker() -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "worker.py"])
+
+
+def wait_status(service_job, job_id: str, statuses: set[str], timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = service_job.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.2)
+    sys.exit(f"Job {job_id} bloqué : {service_job.get(job_id)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--image", required=True, help="Image à prédire")
+    parser.add_argument("--type", required=True, help="Type de modèle")
+    parser.add_argument("--redis-port", type=int, help="Redis déjà lancé")
+    parser.add_argument("--crash", action="store_true")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    port = args.redis_port or free_port()
+    redis_process = None if args.redis_port else start_redis(port, directory)
+
+    # Avant tout import du backend : Config et le client Redis lisent
+    # l'environnement à l'import.
+    os.environ["REDIS_HOST"] = "127.0.0.1"
+    os.environ["REDIS_PORT"] = str(port)
+    os.environ["JOB_QUEUE_NAME"] = f"check:jobs:{os.getpid()}"
+    os.environ["JOB_HEARTBEAT_SECONDS"] = "3"
+    os.environ["MODELS_PRELOAD"] = args.type
+
+    from backend.app.core.const.enum import ENUM_JOB_STATUS
+    from backend.app.services.job_service import service_job
+
+    workers = []
+    try:
+        with open(args.image, "rb") as file:
+            job_id = service_job.submit(args.type, file.read())
+        print(f"job {job_id} déposé")
+
+        workers.append(start_worker())
+        if args.crash:
+            job = wait_status(
+                service_job,
+                job_id,
+                {ENUM_JOB_STATUS.RUNNING.value, ENUM_JOB_STATUS.DONE.value},
+                args.timeout,
+            )
+            if job["status"] != ENUM_JOB_STATUS.RUNNING.value:
+                sys.exit("job terminé avant l'arrêt du worker")
+            workers[0].kill()
+            workers[0].wait()
+            print("worker tué pendant le traitement")
+            workers.append(start_worker())
+
+        job = wait_status(
+            service_job,
+            job_id,
+            {ENUM_JOB_STATUS.DONE.value, ENUM_JOB_STATUS.FAILED.value},
+            args.timeout,
+        )
+        print(job)
+        if job["status"] != ENUM_JOB_STATUS.DONE.value:
+            sys.exit(1)
+        if args.crash and int(job.get("attempts", 0)) < 2:
+            sys.exit("le job n'a pas été repris par le second worker")
+    finally:
+        for worker in workers:
+            worker.kill()
+        if redis_process is not None:
+            redis_process.terminate()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Exporte les modèles Keras (tf2onnx) et timm (torch.onnx) au format ONNX et
+vérifie la parité numérique avec le modèle d'origine.
+
+Usage :
+    python -m backend.tools.export_onnx --types gs,eagt --output model/onnx
+
+Chaque passage avant de Service_MODEL.FORWARD_SPECS produit un fichier
+<type>.<passage>.onnx, chargé ensuite avec MODELS_BACKEND=onnx. Un écart
+maximal supérieur à --tolerance fait échouer l'export.
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+import numpy as np
+import torch
+
+# Les modèles d'origine sont chargés avec le backend natif, quel que soit
+# le .env, avant l'import des services.
+os.environ["MODELS_BACKEND"] = "native"
+os.environ["ONNX_INT8_ENABLED"] = "0"
+
+from backend.app.core.const.enum import ENUM_MODELS_SERVED  # noqa: E402
+from backend.app.services.models_service import Service_MODEL  # noqa: E402
+from backend.app.services.onnx_service import service_onnx  # noqa: E402
+from backend.app.services.preprocess_service import input_shape  # noqa: E402
+
+OPSET = 17
+
+
+def export_keras(model, spec_name: str, path: str) -> None:
+    import tensorflow as tf
+    import tf2onnx
+
+    shape = (None, *input_shape(spec_name, 1)[1:])
+    signature = (tf.TensorSpec(shape, tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(
+        model, input_signature=signature, opset=OPSET, output_path=path
+    )
+
+
+def export_torch(model, spec_name: str, path: str) -> None:
+    dummy = torch.zeros(input_shape(spec_name, 1), dtype=torch.float32)
+    with torch.inference_mode():
+        torch.onnx.export(
+            copy.deepcopy(model).cpu(),
+            dummy,
+            path,
+            input_names=["input"],
+            output_names=["output"],
+            dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}},
+            opset_version=OPSET,
+        )
+
+
+def max_drift(expected, actual) -> float:
+    if not isinstance(expected, (list, tuple)):
+        expected, actual = [expected], [actual]
+    return max(
+        float(np.abs(np.asarray(e) - np.asarray(a)).max())
+        for e, a in zip(expected, actual)
+    )
+
+
+def timeit(function, batch: np.ndarray, repeat: int) -> float:
+    function(batch)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(batch)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--types", default="all")
+    parser.add_argument("--output", default=service_onnx.models_dir)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    typeModels = (
+        ENUM_MODELS_SERVED.TYPES.value
+        if args.types == "all"
+        else [t.strip() for t in args.types.split(",") if t.strip()]
+    )
+    os.makedirs(args.output, exist_ok=True)
+    service_onnx.models_dir = args.output
+
+    rng = np.random.default_rng(0)
+    failed = False
+    print(
+        f"{'passage':<18} {'natif ms':>9} {'onnx ms':>8} {'gain':>6} {'écart max':>10}"
+    )
+    for typeModel in typeModels:
+        model = Service_MODEL(typeModel)
+        for name, native in model.native_models().items():
+            spec_name = model.FORWARD_SPECS[typeModel][name]
+            path = service_onnx.path(typeModel, name)
+
+            if isinstance(native, torch.nn.Module):
+                export_torch(native, spec_name, path)
+            else:
+                export_keras(native, spec_name, path)
+
+            batch = rng.random(input_shape(spec_name, args.batch), dtype=np.float32)
+            onnx_forward = service_onnx.load_path(path)
+            native_forward = model._forwards[name]
+
+            drift = max_drift(native_forward(batch), onnx_forward(batch))
+            native_ms = timeit(native_forward, batch, args.repeat)
+            onnx_ms = timeit(onnx_forward, batch, args.repeat)
+            failed |= drift > args.tolerance
+            print(
+                f"{typeModel + '.' + name:<18} {native_ms:>9.2f} {onnx_ms:>8.2f} "
+                f"{native_ms / onnx_ms:>5.1f}x {drift:>10.2e}"
+                + ("  ÉCHEC" if drift > args.tolerance else "")
+            )
+
+    if failed:
+        sys.exit(f"Parité hors tolérance ({args.tolerance}) pour au moins un modèle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Quantifie en INT8 les modèles EfficientNetV2-M (âge, ethnie) du type eagt
+et compare précision et latence avec la version fp32.
+
+Usage :
+    python -m backend.tools.quantize_int8 --faces data/faces --labels labels.csv
+
+Prérequis : les fichiers fp32 eagt.age.onnx et eagt.ethnicity.onnx produits
+par backend.tools.export_onnx. --faces est un dossier de visages recadrés
+(jpg/png), utilisés pour la calibration statique puis pour l'évaluation
+(--eval permet d'évaluer sur un autre dossier). --labels est un CSV
+optionnel "file,age,ethnicity" (ethnie en indice ou en nom de classe) ;
+sans lui, l'INT8 n'est comparé qu'aux sorties fp32.
+
+Les modèles INT8 sont écrits sous <type>.<passage>.int8.onnx et servis
+avec ONNX_INT8_ENABLED=1.
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import numpy as np
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+from backend.app.core.const.enum import ENUM_CLASSES, ENUM_MODELS_TYPE
+from backend.app.services.image_service import service_image
+from backend.app.services.onnx_service import service_onnx
+from backend.app.services.preprocess_service import build_batch
+
+EAGT = ENUM_MODELS_TYPE.ETHNIE_AGE_GENDER_TRANSFER.value
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def list_faces(folder: str, limit: int | None = None) -> list[str]:
+    files = sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return files[:limit] if limit else files
+
+
+def load_face(path: str) -> np.ndarray:
+    with open(path, "rb") as file:
+        image = service_image.decode(file.read())
+    height, width = image.shape[:2]
+    return build_batch(image, [(0, height, 0, width)], "efficientnet")
+
+
+def load_batches(files: list[str], batch_size: int) -> list[np.ndarray]:
+    return [
+        np.concatenate([load_face(path) for path in files[i : i + batch_size]])
+        for i in range(0, len(files), batch_size)
+    ]
+
+
+class FaceCropsDataReader(CalibrationDataReader):
+    # Fournit les visages de calibration, un par un, à quantize_static.
+
+    def __init__(self, files: list[str], input_name: str) -> None:
+        self._files = iter(files)
+        self._input_name = input_name
+
+    def get_next(self) -> dict | None:
+        path = next(self._files, None)
+        if path is None:
+            return None
+        return {self._input_name: load_face(path)}
+
+
+def quantize(fp32_path: str, int8_path: str, files: list[str], mode: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        # Inférence de formes et fusion des opérateurs avant quantification.
+        prepared = os.path.join(tmp, "prepared.onnx")
+        quant_pre_process(fp32_path, prepared)
+
+        if mode == "dynamic":
+            quantize_dynamic(prepared, int8_path, weight_type=QuantType.QInt8)
+            return
+
+        input_name = service_onnx.session(prepared).get_inputs()[0].name
+        quantize_static(
+            prepared,
+            int8_path,
+            FaceCropsDataReader(files, input_name),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+
+
+def run(forward, batches: list[np.ndarray]) -> tuple[np.ndarray, float]:
+    forward(batches[0])
+    start = time.perf_counter()
+    outputs = np.concatenate([forward(batch) for batch in batches])
+    elapsed = time.perf_counter() - start
+    return outputs, elapsed / len(outputs) * 1000
+
+
+def read_labels(path: str | None, files: list[str]) -> dict[str, np.ndarray]:
+    if not path:
+        return {}
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = {os.path.basename(row["file"]): row for row in csv.DictReader(file)}
+
+    ages, ethnicities = [], []
+    for face in files:
+        row = rows[os.path.basename(face)]
+        ages.append(float(row["age"]))
+        ethnicity = row["ethnicity"]
+        ethnicities.append(
+            int(ethnicity)
+            if ethnicity.isdigit()
+            else ENUM_CLASSES.ETHNICITY.value.index(ethnicity)
+        )
+    return {"age": np.array(ages), "ethnicity": np.array(ethnicities)}
+
+
+def report(name: str, fp32: np.ndarray, int8: np.ndarray, labels: dict) -> str:
+    if name == "age":
+        fp32, int8 = fp32[:, 0], int8[:, 0]
+        line = f"MAE int8/fp32 {np.abs(int8 - fp32).mean():.2f} ans"
+        if "age" in labels:
+            fp32_mae = np.abs(fp32 - labels["age"]).mean()
+            int8_mae = np.abs(int8 - labels["age"]).mean()
+            line += f", MAE fp32 {fp32_mae:.2f} -> int8 {int8_mae:.2f}"
+        return line
+
+    fp32, int8 = fp32.argmax(axis=1), int8.argmax(axis=1)
+    line = f"accord top-1 int8/fp32 {(fp32 == int8).mean():.2%}"
+    if "ethnicity" in labels:
+        fp32_acc = (fp32 == labels["ethnicity"]).mean()
+        int8_acc = (int8 == labels["ethnicity"]).mean()
+        line += f", précision fp32 {fp32_acc:.2%} -> int8 {int8_acc:.2%}"
+    return line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--faces", required=True)
+    parser.add_argument("--eval")
+    parser.add_argument("--labels")
+    parser.add_argument("--calibration", type=int, default=200)
+    parser.add_argument("--mode", choices=("static", "dynamic"), default="static")
+    parser.add_argument("--batch", type=int, default=8)
+    args = parser.parse_args()
+
+    calibration_files = list_faces(args.faces, args.calibration)
+    eval_files = list_faces(args.eval or args.faces)
+    batches = load_batches(eval_files, args.batch)
+    labels = read_labels(args.labels, eval_files)
+
+    print(
+        f"{len(calibration_files)} visages de calibration, {len(eval_files)} "
+        f"visages d'évaluation, mode {args.mode}"
+    )
+    for name in service_onnx.INT8_FORWARDS[EAGT]:
+        fp32_path = service_onnx.path(EAGT, name)
+        int8_path = service_onnx.path(EAGT, name, int8=True)
+        quantize(fp32_path, int8_path, calibration_files, args.mode)
+
+        fp32, fp32_ms = run(service_onnx.load_path(fp32_path), batches)
+        int8, int8_ms = run(service_onnx.load_path(int8_path), batches)
+        size_ratio = os.path.getsize(fp32_path) / os.path.getsize(int8_path)
+
+        print(
+            f"{EAGT}.{name}: fp32 {fp32_ms:.2f} ms/visage, int8 {int8_ms:.2f} "
+            f"ms/visage ({fp32_ms / int8_ms:.1f}x, fichier {size_ratio:.1f}x "
+            f"plus petit) ; {report(name, fp32, int8, labels)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+
+
+def child_exit(server, worker):
+    # Métriques Prometheus multi-processus : on retire les fichiers des
+    # gauges du worker arrêté. (backend.app n'est pas importé ici : il
+    # créerait l'application dans le processus maître.)
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
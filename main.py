@@ -1,4 +1,5 @@
 from backend.app import app, Config
+from backend.app.extension import ext
 
 if __name__ == "__main__":
-    app.run(port=Config.FLASK_PORT)
+    ext.socketio_ext.run(app, port=int(Config.FLASK_PORT or 5000))
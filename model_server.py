@@ -0,0 +1,4 @@
+from backend.app.services.model_server_service import service_model_server
+
+if __name__ == "__main__":
+    service_model_server.serve()
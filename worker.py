@@ -0,0 +1,11 @@
+from backend.app import Config
+from backend.app.services.job_service import service_job
+from backend.app.services.model_server_service import service_model_server
+from backend.app.services.registry_service import service_registry
+
+if __name__ == "__main__":
+    # Avec le serveur de modèles, ce sont ses processus qui chargent les
+    # modèles, comme pour l'application web.
+    if not service_model_server.enabled:
+        service_registry.preload(Config.MODELS_PRELOAD)
+    service_job.run_worker()